@@ -10,6 +10,8 @@ This script provides easy access to research functionality:
 """
 
 import argparse
+import asyncio
+import logging
 import os
 import sys
 import time
@@ -18,8 +20,14 @@ from datetime import datetime
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from club_research_manager import ClubResearchManager
-from email_personalizer import EmailPersonalizer
+from src.club_research_manager import ClubResearchManager, get_prompt_cache_stats
+from src.email_personalizer import EmailPersonalizer
+from src.config import GENERATION_CONCURRENCY, RESEARCH_CONCURRENCY
+
+def print_prompt_cache_summary():
+    """Print how much of this run's prompt input was served from OpenAI's prompt cache"""
+    for model, stats in get_prompt_cache_stats().items():
+        print(f"   Prompt cache ({model}): {stats['cached_input_tokens']:,}/{stats['input_tokens']:,} input tokens ({stats['cache_hit_ratio']:.0%})")
 
 def research_club(args):
     """Research a specific club"""
@@ -95,6 +103,16 @@ def show_statistics(args):
     if stats['total_researched_clubs'] > 0:
         hit_rate = (stats['valid_research_count'] / stats['total_researched_clubs']) * 100
         print(f"Cache hit rate: {hit_rate:.1f}%")
+    
+    email_stats = EmailPersonalizer().get_email_statistics()
+    
+    print("\n📧 Email Statistics")
+    print("=" * 40)
+    print(f"Generated emails: {email_stats['total_emails']}")
+    print(f"Sent emails: {email_stats['sent_emails']}")
+    for email_type, count in email_stats['emails_by_type'].items():
+        print(f"   {email_type.capitalize()}: {count}")
+    print(f"Total email cost: ${email_stats['total_cost']:.4f}")
 
 def list_clubs(args):
     """List all researched clubs"""
@@ -165,8 +183,23 @@ def bulk_research(args):
     total_cost = 0.0
     success_count = 0
     
-    for i, club in enumerate(clubs_to_research, 1):
-        print(f"\n[{i}/{len(clubs_to_research)}] Researching {club['name']}...")
+    sequential_clubs = clubs_to_research
+    if args.batch:
+        # Batch API: half the token price, results within 24h
+        batch_id = manager.submit_research_batch(clubs_to_research)
+        results = manager.collect_research_batch(batch_id, clubs_to_research)
+        for club in clubs_to_research:
+            research_data, costs = results[club['name']]
+            total_cost += costs['total_cost']
+            if research_data.get('is_fallback') or research_data.get('is_partial'):
+                print(f"   ❌ {club['name']}: research failed (left unresearched for the next run)")
+            else:
+                success_count += 1
+                print(f"   ✅ {club['name']} (${costs['total_cost']:.4f})")
+        sequential_clubs = []
+    
+    for i, club in enumerate(sequential_clubs, 1):
+        print(f"\n[{i}/{len(sequential_clubs)}] Researching {club['name']}...")
         
         try:
             start_time = time.time()
@@ -176,12 +209,15 @@ def bulk_research(args):
             end_time = time.time()
             
             total_cost += costs['total_cost']
-            success_count += 1
             
-            print(f"   ✅ Completed in {end_time - start_time:.1f}s (${costs['total_cost']:.4f})")
+            if research_data.get('is_fallback') or research_data.get('is_partial'):
+                print(f"   ❌ Failed after {end_time - start_time:.1f}s (left unresearched for the next run)")
+            else:
+                success_count += 1
+                print(f"   ✅ Completed in {end_time - start_time:.1f}s (${costs['total_cost']:.4f})")
             
             # Small delay to avoid rate limiting
-            if i < len(clubs_to_research):
+            if i < len(sequential_clubs):
                 time.sleep(2)
                 
         except Exception as e:
@@ -191,6 +227,7 @@ def bulk_research(args):
     print(f"   Successfully researched: {success_count}/{len(clubs_to_research)}")
     print(f"   Total cost: ${total_cost:.4f}")
     print(f"   Average cost per club: ${total_cost/success_count:.4f}" if success_count > 0 else "")
+    print_prompt_cache_summary()
 
 def generate_emails(args):
     """Generate emails for researched clubs"""
@@ -213,39 +250,58 @@ def generate_emails(args):
     generated_count = 0
     total_cost = 0.0
     
-    for i, club in enumerate(clubs_to_process, 1):
+    # Skip clubs that already have this email unless forced
+    pending_clubs = []
+    for club in clubs_to_process:
         club_name = club['club_name']
-        print(f"\n[{i}/{len(clubs_to_process)}] Processing {club_name}...")
-        
-        # Check if email already exists
         email_exists, _ = personalizer.check_email_sent(club_name, email_type)
         if email_exists and not args.force:
-            print(f"   ⏭️ {email_type.capitalize()} email already exists (use --force to regenerate)")
+            print(f"   ⏭️ {club_name}: {email_type} email already exists (use --force to regenerate)")
             continue
+        pending_clubs.append(club_name)
+    
+    if args.batch:
+        # Batch API: half the token price, results within 24h
+        batch_id = personalizer.submit_content_batch(pending_clubs, email_type)
+        emails = personalizer.collect_content_batch(batch_id, pending_clubs, email_type)
+        results = [emails[club_name] for club_name in pending_clubs]
+    elif args.pack:
+        # Several clubs per request, for when the requests-per-minute limit is the bottleneck
+        emails = personalizer.generate_packed_emails(pending_clubs, email_type, pack_size=args.pack)
+        results = [emails[club_name] for club_name in pending_clubs]
+    else:
+        # Generate concurrently; the API calls overlap while results are saved in order below
+        results = asyncio.run(
+            personalizer.generate_many(pending_clubs, email_type, concurrency=args.concurrency,
+                                       research_concurrency=args.research_concurrency)
+        )
+    
+    emails_to_save = []
+    for i, (club_name, result) in enumerate(zip(pending_clubs, results), 1):
+        print(f"\n[{i}/{len(pending_clubs)}] {club_name}")
         
-        try:
-            # Generate email
-            complete_email, personalized_content, research, costs = personalizer.generate_personalized_email(club_name, email_type)
-            
-            # Save email
-            personalizer.save_generated_email(
-                club_name, personalized_content, complete_email, costs, email_type
-            )
-            
-            generated_count += 1
-            total_cost += costs['total_cost']
-            
-            print(f"   ✅ Generated ({len(complete_email)} chars, ${costs['total_cost']:.4f})")
-            
-            if args.show_preview:
-                print(f"   Preview: {personalized_content[:100]}...")
-                
-        except Exception as e:
-            print(f"   ❌ Failed: {e}")
+        if isinstance(result, Exception):
+            print(f"   ❌ Failed: {result}")
+            continue
+        
+        complete_email, personalized_content, research, costs = result
+        emails_to_save.append((club_name, personalized_content, complete_email, costs))
+        
+        generated_count += 1
+        total_cost += costs['total_cost']
+        
+        print(f"   ✅ Generated ({len(complete_email)} chars, ${costs['total_cost']:.4f})")
+        
+        if args.show_preview:
+            print(f"   Preview: {personalized_content[:100]}...")
+    
+    # Save all generated emails with one write
+    personalizer.save_generated_emails(emails_to_save, email_type)
     
     print(f"\n📧 Email Generation Summary:")
     print(f"   Successfully generated: {generated_count}/{len(clubs_to_process)}")
     print(f"   Total generation cost: ${total_cost:.4f}")
+    print_prompt_cache_summary()
 
 def main():
     """Main CLI function"""
@@ -259,10 +315,14 @@ Examples:
   %(prog)s stats
   %(prog)s list --show-details
   %(prog)s bulk --count 5
+  %(prog)s bulk --count 50 --batch
   %(prog)s emails introduction --count 3 --show-preview
+  %(prog)s emails checkup --pack 8
         """
     )
     
+    parser.add_argument('--verbose', '-v', action='store_true', help='Show token usage and cost details for each API call')
+    
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Research command
@@ -281,6 +341,7 @@ Examples:
     # Bulk research command
     bulk_parser = subparsers.add_parser('bulk', help='Bulk research multiple clubs')
     bulk_parser.add_argument('--count', type=int, default=5, help='Number of clubs to research (default: 5)')
+    bulk_parser.add_argument('--batch', action='store_true', help='Use the OpenAI Batch API (50%% cheaper, up to 24h)')
     
     # Email generation command
     emails_parser = subparsers.add_parser('emails', help='Generate emails for researched clubs')
@@ -289,9 +350,19 @@ Examples:
     emails_parser.add_argument('--count', type=int, help='Number of emails to generate')
     emails_parser.add_argument('--force', action='store_true', help='Regenerate existing emails')
     emails_parser.add_argument('--show-preview', action='store_true', help='Show email preview')
+    emails_parser.add_argument('--concurrency', type=int, default=GENERATION_CONCURRENCY, help=f'Clubs generated in parallel (default: {GENERATION_CONCURRENCY})')
+    emails_parser.add_argument('--research-concurrency', type=int, default=RESEARCH_CONCURRENCY, help=f'Unresearched clubs auto-researched in parallel (default: {RESEARCH_CONCURRENCY})')
+    emails_parser.add_argument('--batch', action='store_true', help='Use the OpenAI Batch API (50%% cheaper, up to 24h)')
+    emails_parser.add_argument('--pack', type=int, metavar='N', help='Pack N clubs into each content request (e.g. 8)')
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    if args.verbose:
+        # Per-request token usage, cost breakdowns and content insertion details (src modules load under both import paths)
+        for logger_name in ('club_research_manager', 'email_personalizer', 'src.club_research_manager', 'src.email_personalizer'):
+            logging.getLogger(logger_name).setLevel(logging.DEBUG)
+    
     if not args.command:
         parser.print_help()
         return
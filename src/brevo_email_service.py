@@ -2,10 +2,12 @@ import requests
 import json
 import pandas as pd
 import os
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import time
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 # Load environment variables from .env file
 # Look for .env in current directory first, then parent directory
@@ -16,6 +18,12 @@ elif os.path.exists('../.env'):
 else:
     load_dotenv()  # Try default locations
 
+BREVO_RETRY_SECONDS = 300  # a failed connection test is retried after this long
+
+_connected_service = None
+_connect_failed_at = None
+_connect_lock = threading.Lock()
+
 class BrevoEmailService:
     """
     Brevo (formerly Sendinblue) email service for sending and tracking emails
@@ -34,6 +42,10 @@ class BrevoEmailService:
             "api-key": self.api_key
         }
         
+        # One pooled session, so repeated API calls reuse the TCP/TLS connection
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        
         # Initialize email tracking CSV
         self.email_tracking_file = "data/email_tracking.csv"
         self.conversation_file = "data/email_conversations.csv"
@@ -109,7 +121,7 @@ class BrevoEmailService:
             }
             
             # Send email via Brevo API
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/smtp/email",
                 headers=self.headers,
                 json=payload
@@ -361,7 +373,7 @@ class BrevoEmailService:
             end_date_str = end_date.strftime("%Y-%m-%d")
             
             # Fetch email events
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/smtp/statistics/events",
                 headers=self.headers,
                 params={
@@ -512,7 +524,7 @@ class BrevoEmailService:
                 "events": ["delivered", "opened", "clicked", "replied"]
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/webhooks",
                 headers=self.headers,
                 json=webhook_data
@@ -539,7 +551,7 @@ class BrevoEmailService:
     def test_connection(self) -> Dict:
         """Test Brevo API connection"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/account",
                 headers=self.headers
             )
@@ -560,4 +572,20 @@ class BrevoEmailService:
             return {
                 'success': False,
                 'error': f"Connection error: {str(e)}"
-            } 
\ No newline at end of file
+            } 
+
+
+def get_connected_brevo_service() -> Optional[BrevoEmailService]:
+    """Shared BrevoEmailService whose connection test passed, or None; failures are retried after BREVO_RETRY_SECONDS"""
+    global _connected_service, _connect_failed_at
+    with _connect_lock:
+        if _connected_service is None and (_connect_failed_at is None or time.time() - _connect_failed_at >= BREVO_RETRY_SECONDS):
+            try:
+                brevo_service = BrevoEmailService()
+                if brevo_service.test_connection()['success']:
+                    _connected_service = brevo_service
+                else:
+                    _connect_failed_at = time.time()
+            except Exception:
+                _connect_failed_at = time.time()
+        return _connected_service
@@ -1,51 +1,352 @@
-import openai
+import numpy as np
 import pandas as pd
 import os
+import logging
+import io
+import json
+import hashlib
+import time
+import asyncio
+import weakref
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple, List
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, List, TYPE_CHECKING
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.config import *
+from src.semantic_cache import SemanticCache
+from src.completion_cache import (get_completion_cache, cached_chat_completion, cached_chat_completion_async,
+                                  stream_chat_completion, stream_chat_completion_async, is_cached_completion)
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    # Normally imported on the first DataFrame conversion, which fails inside the atexit tracking compaction
+    import pyarrow.pandas_compat  # noqa: F401
+except ImportError:  # optional: faster multi-threaded CSV parsing when installed
+    pa = None
+
+try:
+    import h2
+except ImportError:  # optional: OpenAI clients multiplex requests over HTTP/2 when installed
+    h2 = None
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:  # openai takes ~0.5s to import, so it is only imported once a client is needed
+    import openai
+
+# Static research instructions. Kept byte-identical across calls (no interpolation) so
+# OpenAI's automatic prompt caching can reuse the prefix; club details go in the user message.
+# Keep it above 1024 tokens, the shortest prefix OpenAI caches.
+RESEARCH_SYSTEM_PROMPT = """You are a research assistant with web search capabilities. You must search the internet to find specific, current information about photography clubs and communities. Always use web search to find real, up-to-date information rather than relying on training data. Focus on finding concrete details like recent events, specific activities, and unique characteristics of each club. Structure your response with three distinct sections for different email types.
+
+The user message gives the club's name, country and website. Search the web and find specific, current information about that photography club.
+
+**IMPORTANT: Use web search to find real, current information about this specific club.**
+
+Search for and provide specific details about:
+1. **Recent Activities:** Latest exhibitions, photo walks, workshops, or competitions they've organized (with dates if possible)
+2. **Upcoming Events:** Any announced future events, meetings, or special projects
+3. **Photography Specialties:** What types of photography they focus on (landscape, portrait, street, wildlife, macro, etc.)
+4. **Notable Achievements:** Recent awards, recognition, or member accomplishments
+5. **Unique Characteristics:** What makes this club special or different from others
+6. **Community Projects:** Any community involvement, charity work, or local partnerships
+7. **Member Highlights:** Featured photographers or notable member work
+8. **Club History:** Founding date, milestones, or significant moments
+9. **Active Engagement:** Social media presence, online galleries, member participation
+10. **Educational Focus:** Workshops, tutorials, skill development programs
+11. **Club Structure:** Leadership, membership size, organization
+12. **Communication Channels:** How they reach members, preferred platforms
+
+**CRITICAL:** Please search the web for this specific club and provide concrete findings. Don't provide generic information - I need specific details that prove genuine knowledge of this particular club.
+
+**RESEARCH GUIDELINES:**
+- Start with the club's own website (home, about, events, news, gallery and membership pages), then its social media pages (Facebook, Instagram, Flickr, Meetup), then regional photography federations, exhibition listings and local news coverage.
+- Check that each source is about this exact club: many clubs have similar names, so confirm the town, country or website matches before using a finding.
+- Prefer recent information. Give the month and year for events, exhibitions and competitions, and say so when the most recent information you found is more than a year old.
+- Name specific things: exhibition titles, competition names, workshop topics, venues, guest speakers, awards and the photographers involved.
+- Do not invent details. If a source is ambiguous or you are inferring something (for example membership size from a member gallery), say so.
+- Note in a few words where each key finding came from (club website, Facebook page, federation site, news article), without long URLs.
+- Photography specialties matter for DxO's products: low-light, night and astro work (noise reduction), landscape and architecture (lens and perspective corrections), film looks and creative editing (Nik Collection, FilmPack) and RAW workflows in general. Mention any of these you find evidence of.
+- Take leadership details only from public club pages, and list roles (president, secretary, competition officer) rather than personal contact information.
+
+**FORMAT YOUR RESPONSE WITH THREE DISTINCT SECTIONS:**
+
+=== INTRODUCTION EMAIL RESEARCH ===
+[Information for first contact email offering DxO discount]
+- Recent impressive activities or achievements that would catch their attention
+- Photography specialties that align with DxO software benefits
+- Unique club characteristics that show we've done our research
+- Community engagement that demonstrates their active membership
+- Specific recent events or projects that show their current activity level
+
+=== CHECK-UP EMAIL RESEARCH ===
+[Information for follow-up email when they don't respond to introduction]
+- Upcoming events or deadlines where DxO tools could be valuable
+- Current challenges in their photography work that DxO solves
+- Seasonal activities or competitions coming up
+- Member growth or expansion activities
+- Time-sensitive opportunities that create urgency
+
+=== ACCEPTANCE EMAIL RESEARCH ===
+[Information for when they accept our offer - explaining discount process]
+- Club structure and leadership contact information
+- Membership size and how members typically communicate
+- Existing partnerships or vendor relationships they have
+- How they typically handle member benefits or discounts
+- Best communication channels to reach all members
+- Member skill levels and most used photography techniques
+
+If you cannot find specific information about this exact club, clearly state that in each section and provide what general information you can find about photography clubs in their region, but be honest about the limitations.
+
+Keep each section to concise bullet points. After the acceptance section, write END on its own line and stop."""
+
+RESEARCH_END_MARKER = "\n\nEND"
+
+# Routes research requests that share RESEARCH_SYSTEM_PROMPT to the same prompt-cache shard
+RESEARCH_PROMPT_CACHE_KEY = 'club-research'
+
+
+def research_output_limits(model: str) -> Dict:
+    """Output caps for a research request; o-series reasoning models reject `stop`, so they only get the token cap"""
+    limits = {'max_completion_tokens': RESEARCH_MAX_COMPLETION_TOKENS}
+    if not model.startswith('o'):
+        limits['stop'] = [RESEARCH_END_MARKER]
+    return limits
+
+
+def get_cached_tokens(usage) -> int:
+    """Prompt tokens served from OpenAI's prompt cache (reported under prompt_tokens_details)"""
+    details = getattr(usage, 'prompt_tokens_details', None)
+    cached_tokens = getattr(details, 'cached_tokens', None) if details else None
+    if cached_tokens is None:
+        cached_tokens = getattr(usage, 'prompt_tokens_cached', 0)
+    return cached_tokens or 0
+
+
+# Prompt tokens seen this process, per model: [input tokens, cached input tokens]
+_prompt_cache_totals: Dict[str, List[int]] = {}
+
+
+def record_prompt_cache_usage(model: str, input_tokens: int, cached_tokens: int):
+    """Add one response's prompt tokens to the process-wide prompt cache totals"""
+    totals = _prompt_cache_totals.setdefault(model, [0, 0])
+    totals[0] += input_tokens or 0
+    totals[1] += cached_tokens or 0
+
+
+def log_prompt_cache_ratio(model: str, input_tokens: int, cached_tokens: int):
+    """Print how much of the prompt was served from OpenAI's prompt cache (and add it to the totals)"""
+    record_prompt_cache_usage(model, input_tokens, cached_tokens)
+    if input_tokens:
+        print(f"🗄️ {model} prompt cache: {cached_tokens}/{input_tokens} tokens ({cached_tokens / input_tokens:.0%})")
+
+
+def get_prompt_cache_stats() -> Dict[str, Dict]:
+    """Prompt cache hit ratio per model over every response seen by this process"""
+    return {
+        model: {
+            'input_tokens': input_tokens,
+            'cached_input_tokens': cached_tokens,
+            'cache_hit_ratio': cached_tokens / input_tokens if input_tokens else 0.0
+        }
+        for model, (input_tokens, cached_tokens) in _prompt_cache_totals.items()
+    }
+
+
+# Shared OpenAI clients: every manager instance reuses one pool of keep-alive connections
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> AsyncOpenAI
+
+
+def _http_client_options(openai_module, use_async: bool) -> Dict:
+    """HTTP/2 connection pool for an OpenAI client when h2 is installed; otherwise the SDK's default HTTP/1.1 pool"""
+    if h2 is None:
+        return {}
+    http_client_class = openai_module.DefaultAsyncHttpxClient if use_async else openai_module.DefaultHttpxClient
+    return {'http_client': http_client_class(http2=True)}
+
+
+@lru_cache(maxsize=None)
+def get_openai_client() -> 'openai.OpenAI':
+    """Process-wide OpenAI client with a pooled HTTP connection"""
+    import openai
+    return openai.OpenAI(
+        api_key=OPENAI_API_KEY,
+        timeout=60.0,
+        max_retries=3,
+        **_http_client_options(openai, use_async=False)
+    )
+
+
+def get_async_openai_client() -> 'openai.AsyncOpenAI':
+    """AsyncOpenAI client shared by everything running on the current event loop"""
+    import openai
+    # Pooled async connections are bound to the loop that opened them, so share per loop
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = openai.AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            timeout=60.0,
+            max_retries=3,
+            **_http_client_options(openai, use_async=True)
+        )
+        _async_clients[loop] = client
+    return client
+
+
+# Clubs CSV has quoted fields with backslash escapes and the odd malformed line
+CLUBS_CSV_READ_OPTIONS = {
+    'encoding': 'utf-8',
+    'quotechar': '"',
+    'escapechar': '\\',
+    'on_bad_lines': 'skip',
+    'skipinitialspace': True,
+    'doublequote': True,
+    'sep': ','
+}
+
+
+def read_clubs_csv(csv_path: str) -> pd.DataFrame:
+    """Read the clubs CSV with the C parser, falling back to the slower Python engine if it can't parse it"""
+    try:
+        return pd.read_csv(csv_path, engine='c', low_memory=False, **CLUBS_CSV_READ_OPTIONS)
+    except pd.errors.ParserError as e:
+        print(f"⚠️ C parser failed on clubs CSV ({e}), retrying with the Python engine")
+        return pd.read_csv(csv_path, engine='python', **CLUBS_CSV_READ_OPTIONS)
+
+
+def read_text_csv(csv_path: str, text_columns, float_columns=()) -> pd.DataFrame:
+    """
+    Read one of our generated CSVs, using pyarrow's multi-threaded parser when it is installed
+    (and USE_ARROW_CSV is on).
+    
+    `text_columns` are read as plain strings so ISO dates aren't converted to timestamps, and
+    `float_columns` as float64; with every column typed up front neither parser infers types.
+    """
+    if pa is not None and USE_ARROW_CSV:
+        try:
+            table = pa_csv.read_csv(
+                csv_path,
+                parse_options=pa_csv.ParseOptions(newlines_in_values=True),  # research and emails span lines
+                convert_options=pa_csv.ConvertOptions(
+                    column_types={
+                        **{column: pa.string() for column in text_columns},
+                        **{column: pa.float64() for column in float_columns}
+                    },
+                    strings_can_be_null=True
+                )
+            )
+            df = table.to_pandas()
+            # Same missing values as pd.read_csv (NaN rather than None)
+            return df.where(df.notna(), np.nan)
+        except pa.ArrowInvalid as e:
+            print(f"⚠️ pyarrow could not parse {csv_path} ({e}), falling back to pandas")
+    return pd.read_csv(csv_path, dtype={
+        **{column: str for column in text_columns},
+        **{column: 'float64' for column in float_columns}
+    })
+
+
+def write_text_csv(df: pd.DataFrame, csv_path: str):
+    """Write a DataFrame read with read_text_csv back out, with pyarrow's native CSV writer when available"""
+    if pa is not None and USE_ARROW_CSV:
+        try:
+            pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), csv_path)
+            return
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            print(f"⚠️ pyarrow could not write {csv_path} ({e}), falling back to pandas")
+    df.to_csv(csv_path, index=False)
+
+
+def read_research_csv(research_csv_path: str) -> pd.DataFrame:
+    """Read the club research CSV (see read_text_csv)"""
+    return read_text_csv(research_csv_path, RESEARCH_TEXT_COLUMNS, RESEARCH_COST_COLUMNS)
+
+
+def research_rows_by_club(research_df: pd.DataFrame) -> Dict[str, Dict]:
+    """{club_name: first research row}, with expires_at parsed once (NaT if unreadable)"""
+    first_rows = research_df.drop_duplicates(subset='club_name', keep='first')
+    first_rows = first_rows.assign(expires_at=pd.to_datetime(first_rows['expires_at'], errors='coerce', format='ISO8601'))
+    return dict(zip(first_rows['club_name'], first_rows.to_dict('records')))
+
+
+def first_row_per_club(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per club (its first contact row), sorted by club name"""
+    return (
+        df.dropna(subset=['Club'])
+        .drop_duplicates(subset='Club', keep='first')
+        .sort_values('Club', kind='stable', ignore_index=True)
+    )
+
+
+RESEARCH_COST_COLUMNS = ['search_cost', 'web_search_cost', 'total_cost']
+RESEARCH_TEXT_COLUMNS = (
+    'club_name', 'country', 'website', 'introduction_research', 'checkup_research',
+    'acceptance_research', 'full_research_data', 'researched_at', 'expires_at', 'research_key'
+)
+
+
+def research_cache_key(model: str, club_name: str, country: str = None, website: str = None) -> str:
+    """SHA-256 of the inputs that determine a club's research; stored research with another key is stale"""
+    fields = [model] + ['' if pd.isna(value) else str(value).strip() for value in (club_name, country, website)]
+    return hashlib.sha256(json.dumps(fields).encode('utf-8')).hexdigest()
+
+
+def _normalize_club_detail(value, is_website: bool = False) -> str:
+    """Lower-cased club name, country or website for comparisons ('' when missing); websites lose the scheme, www. and trailing /"""
+    if value is None or pd.isna(value):
+        return ''
+    value = ' '.join(str(value).lower().split())
+    if is_website:
+        value = value.split('://', 1)[-1].rstrip('/')
+        if value.startswith('www.'):
+            value = value[len('www.'):]
+    return value
+
 
 class CostTracker:
     """Track costs for different AI models and operations"""
     
-    def __init__(self):
+    def __init__(self, batch_discount: float = 1.0):
         self.costs = {
             'search_cost': 0.0,
             'content_cost': 0.0,
             'web_search_cost': 0.0,
             'total_cost': 0.0
         }
+        # Token price multiplier; BATCH_DISCOUNT for requests sent through the Batch API
+        self.batch_discount = batch_discount
     
     def calculate_token_cost(self, model: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> float:
         """Calculate cost based on token usage including cached tokens"""
-        if model not in PRICING:
-            print(f"⚠️ Warning: Model '{model}' not found in pricing configuration")
+        prices = PRICING.get(model)
+        if prices is None:
+            logger.warning("Model '%s' not found in pricing configuration", model)
             return 0.0
         
-        # Calculate regular input cost (exclude cached tokens from regular input)
-        regular_input_tokens = max(0, input_tokens - cached_tokens)
-        input_cost = (regular_input_tokens / 1_000_000) * PRICING[model]['input']
+        # Per-token prices, looked up once
+        input_price = prices['input'] / 1_000_000
+        cached_price = prices.get('cached_input', 0.0) / 1_000_000
+        output_price = prices['output'] / 1_000_000
         
-        # Calculate cached input cost if applicable
-        cached_cost = 0.0
-        if cached_tokens > 0 and 'cached_input' in PRICING[model]:
-            cached_cost = (cached_tokens / 1_000_000) * PRICING[model]['cached_input']
-        
-        # Calculate output cost
-        output_cost = (output_tokens / 1_000_000) * PRICING[model]['output']
+        # Cached tokens are billed at the cached rate instead of the regular input rate
+        regular_input_tokens = max(0, input_tokens - cached_tokens)
+        input_cost = regular_input_tokens * input_price
+        cached_cost = cached_tokens * cached_price if cached_tokens > 0 else 0.0
+        output_cost = output_tokens * output_price
         
-        total_cost = input_cost + cached_cost + output_cost
+        total_cost = (input_cost + cached_cost + output_cost) * self.batch_discount
         
-        # Log detailed token usage and costs
-        print(f"📊 Token Usage for {model}:")
-        print(f"   Input tokens: {input_tokens:,}")
-        print(f"   Regular input tokens: {regular_input_tokens:,} (${input_cost:.6f})")
-        if cached_tokens > 0:
-            print(f"   Cached input tokens: {cached_tokens:,} (${cached_cost:.6f})")
-        print(f"   Output tokens: {output_tokens:,} (${output_cost:.6f})")
-        print(f"   Total cost: ${total_cost:.6f}")
+        # Detailed breakdown only when debug logging is on (e.g. research_cli.py --verbose)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Token usage for %s: input %s (regular %s = $%.6f, cached %s = $%.6f), output %s = $%.6f, "
+                "batch discount x%s, total $%.6f",
+                model, f"{input_tokens:,}", f"{regular_input_tokens:,}", input_cost, f"{cached_tokens:,}", cached_cost,
+                f"{output_tokens:,}", output_cost, self.batch_discount, total_cost
+            )
         
         return total_cost
     
@@ -55,6 +356,12 @@ class CostTracker:
         self.costs['search_cost'] += cost
         self.costs['total_cost'] += cost
     
+    def add_embedding_cost(self, input_tokens: int):
+        """Add cost for embedding a research prompt (billed as part of research)"""
+        cost = self.calculate_token_cost(EMBEDDING_MODEL, input_tokens, 0)
+        self.costs['search_cost'] += cost
+        self.costs['total_cost'] += cost
+    
     def add_web_search_cost(self, num_queries: int = 1):
         """Add cost for web search operations"""
         cost = num_queries * WEB_SEARCH_COST_PER_QUERY
@@ -65,6 +372,96 @@ class CostTracker:
         """Get all tracked costs"""
         return self.costs.copy()
 
+def submit_chat_batch(client: 'openai.OpenAI', requests: List[Tuple[str, Dict]]) -> str:
+    """
+    Submit chat completion requests through the OpenAI Batch API.
+    
+    `requests` holds (custom_id, request_body) pairs. Returns the batch id; results
+    arrive within the 24h completion window at half the synchronous token price.
+    """
+    lines = [
+        json.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body})
+        for custom_id, body in requests
+    ]
+    batch_file = client.files.create(
+        file=("chat_batch.jsonl", io.BytesIO("\n".join(lines).encode("utf-8"))),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"📦 Submitted batch {batch.id} with {len(requests)} requests")
+    return batch.id
+
+def fetch_chat_batch(client: 'openai.OpenAI', batch_id: str) -> Optional[Dict[str, object]]:
+    """
+    Return {custom_id: ChatCompletion or Exception} once the batch has finished,
+    or None while it is still running.
+    """
+    from openai.types.chat import ChatCompletion
+    
+    batch = client.batches.retrieve(batch_id)
+    if batch.status in ('validating', 'in_progress', 'finalizing'):
+        return None
+    
+    results = {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in client.files.content(file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get('response') or {}
+            if response.get('status_code') == 200:
+                results[record['custom_id']] = ChatCompletion.model_validate(response['body'])
+            else:
+                error = record.get('error') or response.get('body', {}).get('error')
+                results[record['custom_id']] = RuntimeError(f"Batch request failed: {error}")
+    
+    if batch.status != 'completed':
+        print(f"⚠️ Batch {batch_id} ended with status '{batch.status}'")
+    return results
+
+def calculate_token_costs_batch(model: str, token_counts: List[Tuple[int, int, int]], batch_discount: float = 1.0) -> np.ndarray:
+    """Vectorized CostTracker.calculate_token_cost over (input, output, cached) token counts"""
+    prices = PRICING.get(model)
+    if prices is None:
+        logger.warning("Model '%s' not found in pricing configuration", model)
+        return np.zeros(len(token_counts))
+    
+    counts = np.asarray(token_counts, dtype=np.float64).reshape(-1, 3)
+    input_tokens, output_tokens, cached_tokens = counts.T
+    regular_input_tokens = np.maximum(input_tokens - cached_tokens, 0)
+    costs = (
+        regular_input_tokens * prices['input']
+        + cached_tokens * prices.get('cached_input', 0.0)
+        + output_tokens * prices['output']
+    ) / 1_000_000
+    return costs * batch_discount
+
+def log_batch_token_cost(model: str, results: Dict[str, object]):
+    """Print the token cost of a finished batch, computed in one pass"""
+    token_counts = []
+    for response in results.values():
+        usage = getattr(response, 'usage', None)
+        if usage:
+            token_counts.append((getattr(usage, 'prompt_tokens', 0), getattr(usage, 'completion_tokens', 0), get_cached_tokens(usage)))
+            record_prompt_cache_usage(model, token_counts[-1][0], token_counts[-1][2])
+    costs = calculate_token_costs_batch(model, token_counts, BATCH_DISCOUNT)
+    print(f"💰 Batch {model} token cost: ${costs.sum():.4f} over {len(costs)} responses")
+
+def wait_for_chat_batch(client: 'openai.OpenAI', batch_id: str, poll_interval: float = 60.0) -> Dict[str, object]:
+    """Poll a batch until it finishes and return its results"""
+    while True:
+        results = fetch_chat_batch(client, batch_id)
+        if results is not None:
+            return results
+        print(f"⏳ Batch {batch_id} still running, checking again in {poll_interval:.0f}s")
+        time.sleep(poll_interval)
+
 class ClubResearchManager:
     """
     Manages club research using O3 web search and stores results in CSV format.
@@ -75,19 +472,40 @@ class ClubResearchManager:
         if not OPENAI_API_KEY:
             raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in environment variables or .env file")
         
-        try:
-            self.openai_client = openai.OpenAI(
-                api_key=OPENAI_API_KEY,
-                timeout=60.0,
-                max_retries=3,
-            )
-        except Exception as e:
-            raise ValueError(f"Failed to initialize OpenAI client: {e}")
+        # Clients are created (and openai imported) on first use, so CSV-only commands start quickly
+        self._openai_client = None
+        self._async_client = None
         
         self.research_csv_path = CLUBS_RESEARCH_CSV_PATH
         self.cache_expiry_days = 30
+        self._clubs_df = None
+        self._clubs_mtime = None
+        self._research_by_name: Dict[str, Dict] = {}
+        self._research_mtime = None
+        self.semantic_cache = SemanticCache(SEMANTIC_CACHE_PATH, 'research', SEMANTIC_CACHE_THRESHOLD) if SEMANTIC_CACHE_ENABLED else None
+        self.completion_cache = get_completion_cache(
+            COMPLETION_CACHE_PATH, COMPLETION_CACHE_MAX_ENTRIES, COMPLETION_CACHE_TTL_SECONDS, ALLOW_STOCHASTIC_CACHE
+        ) if COMPLETION_CACHE_ENABLED else None
         self._initialize_research_csv()
     
+    @property
+    def openai_client(self) -> 'openai.OpenAI':
+        """Shared OpenAI client (unless one was assigned)"""
+        return self._openai_client or get_openai_client()
+    
+    @openai_client.setter
+    def openai_client(self, client: 'openai.OpenAI'):
+        self._openai_client = client
+    
+    @property
+    def async_client(self) -> 'openai.AsyncOpenAI':
+        """Shared AsyncOpenAI client for the running event loop (unless one was assigned)"""
+        return self._async_client or get_async_openai_client()
+    
+    @async_client.setter
+    def async_client(self, client: 'openai.AsyncOpenAI'):
+        self._async_client = client
+    
     def _initialize_research_csv(self):
         """Initialize CSV file to store club research results"""
         if not os.path.exists(self.research_csv_path):
@@ -95,30 +513,29 @@ class ClubResearchManager:
                 'club_name', 'country', 'website',
                 'introduction_research', 'checkup_research', 'acceptance_research',
                 'full_research_data', 'search_cost', 'web_search_cost', 'total_cost',
-                'researched_at', 'expires_at', 'is_valid'
+                'researched_at', 'expires_at', 'is_valid', 'research_key'
             ])
             research_df.to_csv(self.research_csv_path, index=False)
     
     def load_clubs_data(self) -> pd.DataFrame:
-        """Load clubs data from CSV file"""
+        """Load clubs data from CSV file (cached until the file changes)"""
         try:
-            df = pd.read_csv(
-                CLUBS_CSV_PATH,
-                encoding='utf-8',
-                quotechar='"',
-                escapechar='\\',
-                on_bad_lines='skip',
-                engine='python',
-                skipinitialspace=True,
-                doublequote=True,
-                sep=','
-            )
+            clubs_mtime = os.stat(CLUBS_CSV_PATH).st_mtime
+        except OSError:
+            clubs_mtime = None
+        if self._clubs_df is not None and clubs_mtime is not None and clubs_mtime == self._clubs_mtime:
+            return self._clubs_df
+        
+        try:
+            df = read_clubs_csv(CLUBS_CSV_PATH)
             
             print(f"✅ Loaded {len(df)} records from CSV")
             
             if 'Club' in df.columns:
-                unique_clubs = df.groupby('Club').first().reset_index()
+                unique_clubs = first_row_per_club(df)
                 print(f"✅ Found {len(unique_clubs)} unique clubs")
+                self._clubs_df = unique_clubs
+                self._clubs_mtime = clubs_mtime
                 return unique_clubs
             else:
                 print(f"❌ 'Club' column not found in CSV. Available columns: {list(df.columns)}")
@@ -128,16 +545,25 @@ class ClubResearchManager:
             print(f"❌ Error loading clubs data: {e}")
             return pd.DataFrame()
     
+    def invalidate_clubs_cache(self):
+        """Force the next load_clubs_data to re-read the clubs CSV (e.g. after an in-place edit within the same mtime tick)"""
+        self._clubs_df = None
+    
+    def get_research_rows(self) -> Dict[str, Dict]:
+        """Research rows by club name (see research_rows_by_club), re-read only when the research CSV changes"""
+        research_mtime = os.stat(self.research_csv_path).st_mtime
+        if research_mtime != self._research_mtime:
+            self._research_by_name = research_rows_by_club(read_research_csv(self.research_csv_path))
+            self._research_mtime = research_mtime
+        return self._research_by_name
+    
     def is_research_cached(self, club_name: str) -> bool:
         """Check if club research is cached and still valid"""
         try:
-            research_df = pd.read_csv(self.research_csv_path)
-            club_research = research_df[research_df['club_name'] == club_name]
+            research_entry = self.get_research_rows().get(club_name)
             
-            if not club_research.empty:
-                research_entry = club_research.iloc[0]
-                expires_at = pd.to_datetime(research_entry['expires_at'])
-                return datetime.now() < expires_at
+            if research_entry is not None:
+                return datetime.now() < research_entry['expires_at']
             
             return False
         except:
@@ -146,12 +572,10 @@ class ClubResearchManager:
     def get_cached_research(self, club_name: str) -> Optional[Dict]:
         """Get cached research for a club if valid"""
         try:
-            research_df = pd.read_csv(self.research_csv_path)
-            club_research = research_df[research_df['club_name'] == club_name]
+            research_entry = self.get_research_rows().get(club_name)
             
-            if not club_research.empty:
-                research_entry = club_research.iloc[0]
-                expires_at = pd.to_datetime(research_entry['expires_at'])
+            if research_entry is not None:
+                expires_at = research_entry['expires_at']
                 
                 if datetime.now() < expires_at:
                     print(f"🎯 Using cached research for {club_name}")
@@ -164,13 +588,16 @@ class ClubResearchManager:
                         'web_search_cost': research_entry.get('web_search_cost', 0.0),
                         'total_cost': research_entry.get('total_cost', 0.0),
                         'researched_at': research_entry['researched_at'],
+                        'research_key': research_entry.get('research_key'),
                         'from_cache': True
                     }
                 else:
                     print(f"⏰ Research expired for {club_name}")
                     # Clean up expired entry
+                    research_df = read_research_csv(self.research_csv_path)
                     research_df = research_df[research_df['club_name'] != club_name]
-                    research_df.to_csv(self.research_csv_path, index=False)
+                    write_text_csv(research_df, self.research_csv_path)
+                    self._research_mtime = None
             
             return None
         except Exception as e:
@@ -181,132 +608,307 @@ class ClubResearchManager:
         """Research club using O3 and return structured research data"""
         
         # Check cache first
-        cached_research = self.get_cached_research(club_name)
+        cached_research = self._get_cached_research_with_costs(club_name, website, country)
         if cached_research:
-            return cached_research, {
-                'search_cost': cached_research['search_cost'],
-                'web_search_cost': cached_research['web_search_cost'],
-                'total_cost': cached_research['total_cost']
-            }
+            return cached_research
         
-        print(f"🔍 Performing new research for {club_name}")
         cost_tracker = CostTracker()
-        cost_tracker.add_web_search_cost(1)
-        
-        search_query = f"photography club '{club_name}'"
-        if country:
-            search_query += f" {country}"
-        if website:
-            search_query += f" site:{website}"
-        
-        search_prompt = f"""
-        You are a research assistant with web search capabilities. I need you to search the web and find specific, current information about the photography club "{club_name}".
-
-        **IMPORTANT: Use web search to find real, current information about this specific club.**
-
-        Search for and provide specific details about:
-        1. **Recent Activities:** Latest exhibitions, photo walks, workshops, or competitions they've organized (with dates if possible)
-        2. **Upcoming Events:** Any announced future events, meetings, or special projects
-        3. **Photography Specialties:** What types of photography they focus on (landscape, portrait, street, wildlife, macro, etc.)
-        4. **Notable Achievements:** Recent awards, recognition, or member accomplishments
-        5. **Unique Characteristics:** What makes this club special or different from others
-        6. **Community Projects:** Any community involvement, charity work, or local partnerships
-        7. **Member Highlights:** Featured photographers or notable member work
-        8. **Club History:** Founding date, milestones, or significant moments
-        9. **Active Engagement:** Social media presence, online galleries, member participation
-        10. **Educational Focus:** Workshops, tutorials, skill development programs
-        11. **Club Structure:** Leadership, membership size, organization
-        12. **Communication Channels:** How they reach members, preferred platforms
-        
-        Club details to help your search:
-        - Name: {club_name}
-        - Country: {country if country else 'Unknown'}
-        - Website: {website if website else 'Not provided'}
-        
-        **CRITICAL:** Please search the web for this specific club and provide concrete findings. Don't provide generic information - I need specific details that prove genuine knowledge of this particular club.
-        
-        **FORMAT YOUR RESPONSE WITH THREE DISTINCT SECTIONS:**
-
-        === INTRODUCTION EMAIL RESEARCH ===
-        [Information for first contact email offering DxO discount]
-        - Recent impressive activities or achievements that would catch their attention
-        - Photography specialties that align with DxO software benefits
-        - Unique club characteristics that show we've done our research
-        - Community engagement that demonstrates their active membership
-        - Specific recent events or projects that show their current activity level
-
-        === CHECK-UP EMAIL RESEARCH ===
-        [Information for follow-up email when they don't respond to introduction]
-        - Upcoming events or deadlines where DxO tools could be valuable
-        - Current challenges in their photography work that DxO solves
-        - Seasonal activities or competitions coming up
-        - Member growth or expansion activities
-        - Time-sensitive opportunities that create urgency
-
-        === ACCEPTANCE EMAIL RESEARCH ===
-        [Information for when they accept our offer - explaining discount process]
-        - Club structure and leadership contact information
-        - Membership size and how members typically communicate
-        - Existing partnerships or vendor relationships they have
-        - How they typically handle member benefits or discounts
-        - Best communication channels to reach all members
-        - Member skill levels and most used photography techniques
-
-        If you cannot find specific information about this exact club, clearly state that in each section and provide what general information you can find about photography clubs in their region, but be honest about the limitations.
-        """
+        messages = self._build_search_messages(club_name, website, country)
+        
+        # Near-duplicate prompts (e.g. abbreviated club names) reuse earlier research
+        embedding = None
+        if self.semantic_cache:
+            embedding = self._embed_prompt(messages[-1]['content'], cost_tracker)
+            semantic_hit = self._semantic_cache_hit(embedding, club_name, website, country, cost_tracker)
+            if semantic_hit:
+                return semantic_hit
+        
+        print(f"🔍 Performing new research for {club_name}")
+        
+        request = {
+            "model": SEARCH_MODEL,
+            "messages": messages,
+            "prompt_cache_key": RESEARCH_PROMPT_CACHE_KEY,
+            **research_output_limits(SEARCH_MODEL)
+        }
         
         try:
-            response = self.openai_client.chat.completions.create(
-                model=SEARCH_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a research assistant with web search capabilities. You must search the internet to find specific, current information about photography clubs and communities. Always use web search to find real, up-to-date information rather than relying on training data. Focus on finding concrete details like recent events, specific activities, and unique characteristics of each club. Structure your response with three distinct sections for different email types."},
-                    {"role": "user", "content": search_prompt}
-                ]
-            )
-            
-            # Track costs
-            if hasattr(response, 'usage') and response.usage:
-                usage = response.usage
-                input_tokens = getattr(usage, 'prompt_tokens', 0)
-                output_tokens = getattr(usage, 'completion_tokens', 0)
-                cached_tokens = getattr(usage, 'prompt_tokens_cached', 0)
-                
-                print(f"🔍 {SEARCH_MODEL} API Response Usage:")
-                print(f"   Input tokens: {input_tokens}")
-                print(f"   Output tokens: {output_tokens}")
-                print(f"   Cached tokens: {cached_tokens}")
-                
-                cost_tracker.add_search_cost(input_tokens, output_tokens, cached_tokens)
-            
-            full_research = response.choices[0].message.content.strip()
-            
-            # Parse the research into sections
-            research_sections = self._parse_research_sections(full_research)
-            
-            # Save to CSV
-            costs = cost_tracker.get_costs()
-            self._save_research_to_csv(club_name, country or '', website or '', 
-                                     research_sections, full_research, costs)
+            complete = stream_chat_completion if RESEARCH_STREAM else cached_chat_completion
+            response = complete(self.openai_client, self.completion_cache, **request)
+            if not is_cached_completion(response):
+                cost_tracker.add_web_search_cost(1)
+            research_sections, costs = self._handle_research_response(response, club_name, website, country, cost_tracker)
+            if research_sections.get('is_fallback') and self.completion_cache is not None:
+                self.completion_cache.discard(request)  # an empty reply must not be replayed
+            self._semantic_cache_store(embedding, club_name, website, country, research_sections)
+            return research_sections, costs
             
+        except Exception as e:
+            if self.completion_cache is not None:
+                self.completion_cache.discard(request)
+            return self._fallback_research(e, club_name, website, country, cost_tracker)
+    
+    async def research_club_with_o3_async(self, club_name: str, website: str = None, country: str = None) -> Tuple[Dict, Dict]:
+        """Async variant of research_club_with_o3, so several clubs can be researched concurrently"""
+        
+        cached_research = self._get_cached_research_with_costs(club_name, website, country)
+        if cached_research:
+            return cached_research
+        
+        cost_tracker = CostTracker()
+        messages = self._build_search_messages(club_name, website, country)
+        
+        embedding = None
+        if self.semantic_cache:
+            embedding = await self._embed_prompt_async(messages[-1]['content'], cost_tracker)
+            semantic_hit = self._semantic_cache_hit(embedding, club_name, website, country, cost_tracker)
+            if semantic_hit:
+                return semantic_hit
+        
+        print(f"🔍 Performing new research for {club_name}")
+        
+        request = {
+            "model": SEARCH_MODEL,
+            "messages": messages,
+            "prompt_cache_key": RESEARCH_PROMPT_CACHE_KEY,
+            **research_output_limits(SEARCH_MODEL)
+        }
+        
+        try:
+            complete = stream_chat_completion_async if RESEARCH_STREAM else cached_chat_completion_async
+            response = await complete(self.async_client, self.completion_cache, **request)
+            if not is_cached_completion(response):
+                cost_tracker.add_web_search_cost(1)
+            research_sections, costs = self._handle_research_response(response, club_name, website, country, cost_tracker)
+            if research_sections.get('is_fallback') and self.completion_cache is not None:
+                self.completion_cache.discard(request)  # an empty reply must not be replayed
+            self._semantic_cache_store(embedding, club_name, website, country, research_sections)
             return research_sections, costs
             
         except Exception as e:
-            print(f"Error researching club {club_name} with O3: {e}")
-            
-            # Create fallback research
-            fallback_sections = {
-                'introduction_research': f"Unable to find specific current information about {club_name} due to research limitations. General photography club activities assumed based on location: {country if country else 'Unknown region'}. Focus on general photography community support and learning more about their specific activities.",
-                'checkup_research': f"No specific upcoming events or challenges found for {club_name}. Suggest focusing on general photography season activities and mention common photography club needs and DxO benefits.",
-                'acceptance_research': f"No specific club structure information found for {club_name}. Assume standard photography club structure with leadership team. Recommend standard member communication approach and focus on general DxO software benefits for club members.",
-                'full_research_data': f"Research failed for {club_name}. Using fallback information.",
-                'from_cache': False
-            }
+            if self.completion_cache is not None:
+                self.completion_cache.discard(request)
+            return self._fallback_research(e, club_name, website, country, cost_tracker)
+    
+    def submit_research_batch(self, clubs: List[Dict]) -> str:
+        """
+        Submit research for many clubs through the Batch API (50% token discount).
+        
+        `clubs` are dicts with 'name', 'website' and 'country' keys, as built by the bulk CLI.
+        Pass the same list to collect_research_batch once the batch has finished.
+        """
+        # Club names are the batch custom_ids, which must be unique
+        unique_clubs = {}
+        for club in clubs:
+            unique_clubs.setdefault(club['name'], club)
+        
+        requests = [
+            (club['name'], {
+                "model": SEARCH_MODEL,
+                "messages": self._build_search_messages(club['name'], club.get('website'), club.get('country')),
+                "prompt_cache_key": RESEARCH_PROMPT_CACHE_KEY,
+                **research_output_limits(SEARCH_MODEL)
+            })
+            for club in unique_clubs.values()
+        ]
+        return submit_chat_batch(self.openai_client, requests)
+    
+    def collect_research_batch(self, batch_id: str, clubs: List[Dict], wait: bool = True,
+                               poll_interval: float = 60.0) -> Optional[Dict[str, Tuple[Dict, Dict]]]:
+        """
+        Parse and save the results of submit_research_batch.
+        
+        Returns {club_name: (research_sections, costs)}, or None if `wait` is False
+        and the batch has not finished yet. Failed clubs get fallback sections marked 'is_fallback'.
+        """
+        if wait:
+            results = wait_for_chat_batch(self.openai_client, batch_id, poll_interval)
+        else:
+            results = fetch_chat_batch(self.openai_client, batch_id)
+            if results is None:
+                return None
+        log_batch_token_cost(SEARCH_MODEL, results)
+        
+        research = {}
+        for club in clubs:
+            club_name = club['name']
+            cost_tracker = CostTracker(batch_discount=BATCH_DISCOUNT)
+            response = results.get(club_name, RuntimeError("No result returned for this club"))
             
-            costs = cost_tracker.get_costs()
-            self._save_research_to_csv(club_name, country or '', website or '', 
-                                     fallback_sections, fallback_sections['full_research_data'], costs)
+            # Failed clubs get unsaved fallback research, so they stay unresearched and are retried
+            if isinstance(response, Exception):
+                research[club_name] = self._fallback_research(response, club_name, club.get('website'), club.get('country'), cost_tracker)
+            else:
+                cost_tracker.add_web_search_cost(1)
+                research[club_name] = self._handle_research_response(response, club_name, club.get('website'), club.get('country'), cost_tracker)
+        
+        return research
+    
+    def _embed_prompt(self, prompt: str, cost_tracker: CostTracker) -> Optional[List[float]]:
+        """Embed a research prompt for the semantic cache (None if the call fails)"""
+        try:
+            response = self.openai_client.embeddings.create(model=EMBEDDING_MODEL, input=prompt)
+            cost_tracker.add_embedding_cost(getattr(response.usage, 'prompt_tokens', 0))
+            return response.data[0].embedding
+        except Exception as e:
+            print(f"⚠️ Semantic cache embedding failed: {e}")
+            return None
+    
+    async def _embed_prompt_async(self, prompt: str, cost_tracker: CostTracker) -> Optional[List[float]]:
+        """Async variant of _embed_prompt"""
+        try:
+            response = await self.async_client.embeddings.create(model=EMBEDDING_MODEL, input=prompt)
+            cost_tracker.add_embedding_cost(getattr(response.usage, 'prompt_tokens', 0))
+            return response.data[0].embedding
+        except Exception as e:
+            print(f"⚠️ Semantic cache embedding failed: {e}")
+            return None
+    
+    def _semantic_cache_hit(self, embedding, club_name: str, website: str, country: str,
+                            cost_tracker: CostTracker) -> Optional[Tuple[Dict, Dict]]:
+        """Reuse research from a similar prompt for the same club details, charging only the embedding"""
+        if embedding is None:
+            return None
+        
+        match = self.semantic_cache.lookup(embedding)
+        if not match:
+            return None
+        
+        # The prompt is short, so different clubs in one country can look alike; require the same website
+        # (or, when neither has one, the same club name and country)
+        cached_sections, similarity = match
+        cached_website = _normalize_club_detail(cached_sections.get('website'), is_website=True)
+        this_website = _normalize_club_detail(website, is_website=True)
+        if cached_website or this_website:
+            same_club = cached_website == this_website
+        else:
+            same_club = all(
+                _normalize_club_detail(cached_sections.get(field)) == _normalize_club_detail(value)
+                for field, value in (('club_name', club_name), ('country', country))
+            )
+        if not same_club:
+            return None
+        
+        print(f"🎯 Semantic cache hit for {club_name} (similarity {similarity:.3f}, from {cached_sections.get('club_name')})")
+        research_sections = {
+            'introduction_research': cached_sections['introduction_research'],
+            'checkup_research': cached_sections['checkup_research'],
+            'acceptance_research': cached_sections['acceptance_research'],
+            'full_research_data': cached_sections['full_research_data'],
+            'from_cache': True
+        }
+        # Not saved under this club's name: a near match is used for this email only
+        return research_sections, cost_tracker.get_costs()
+    
+    def _semantic_cache_store(self, embedding, club_name: str, website: str, country: str, research_sections: Dict):
+        """Remember fresh research for future near-duplicate prompts"""
+        if self.semantic_cache is None or embedding is None:
+            return
+        if research_sections.get('is_fallback') or research_sections.get('is_partial'):
+            return
+        try:
+            self.semantic_cache.store(club_name, embedding, {
+                'club_name': club_name,
+                'website': website or '',
+                'country': country or '',
+                'introduction_research': research_sections['introduction_research'],
+                'checkup_research': research_sections['checkup_research'],
+                'acceptance_research': research_sections['acceptance_research'],
+                'full_research_data': research_sections['full_research_data']
+            })
+        except Exception as e:
+            print(f"⚠️ Error storing semantic cache entry: {e}")
+    
+    def _get_cached_research_with_costs(self, club_name: str, website: str = None,
+                                        country: str = None) -> Optional[Tuple[Dict, Dict]]:
+        """Return (research, zero costs) from the cache, or None on a miss"""
+        cached_research = self.get_cached_research(club_name)
+        if not cached_research:
+            return None
+        
+        # Rows saved before research_key existed have no key and are still served
+        stored_key = cached_research.get('research_key')
+        if isinstance(stored_key, str) and stored_key != research_cache_key(SEARCH_MODEL, club_name, country, website):
+            print(f"🔄 Research inputs changed for {club_name} (model, country or website); researching again")
+            return None
+        
+        # Nothing is billed for a cache hit; the original cost stays in the research CSV
+        return cached_research, {'search_cost': 0.0, 'web_search_cost': 0.0, 'total_cost': 0.0}
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _build_search_prompt(club_name: str, website: str = None, country: str = None) -> str:
+        """Render the club details message once per club; retries and the embedding reuse the same string"""
+        return f"Club: {club_name}\nCountry: {country if country else 'Unknown'}\nWebsite: {website if website else 'Not provided'}"
+    
+    def _build_search_messages(self, club_name: str, website: str = None, country: str = None) -> List[Dict]:
+        """Build the chat messages for the O3 research request (static system prefix, club details last)"""
+        return [
+            {"role": "system", "content": RESEARCH_SYSTEM_PROMPT},
+            {"role": "user", "content": self._build_search_prompt(club_name, website, country)}
+        ]
+    
+    def _handle_research_response(self, response, club_name: str, website: str, country: str,
+                                  cost_tracker: CostTracker) -> Tuple[Dict, Dict]:
+        """Track costs, parse sections and persist the research from an O3 response (cut-off research is not persisted)"""
+        # Track costs
+        if hasattr(response, 'usage') and response.usage:
+            usage = response.usage
+            input_tokens = getattr(usage, 'prompt_tokens', 0)
+            output_tokens = getattr(usage, 'completion_tokens', 0)
+            cached_tokens = get_cached_tokens(usage)
+            
+            print(f"🔍 {SEARCH_MODEL} API Response Usage:")
+            print(f"   Input tokens: {input_tokens}")
+            print(f"   Output tokens: {output_tokens}")
+            print(f"   Cached tokens: {cached_tokens}")
+            log_prompt_cache_ratio(SEARCH_MODEL, input_tokens, cached_tokens)
             
-            return fallback_sections, costs
+            cost_tracker.add_search_cost(input_tokens, output_tokens, cached_tokens)
+        
+        choice = response.choices[0]
+        
+        # Models without `stop` support still print the END marker; drop it
+        full_research = (choice.message.content or '').strip()
+        lines = full_research.splitlines()
+        if lines and lines[-1].strip() == RESEARCH_END_MARKER.strip():
+            full_research = "\n".join(lines[:-1]).rstrip()
+        
+        # The output cap also counts reasoning tokens, so a capped reply can be empty
+        if not full_research:
+            return self._fallback_research(ValueError("empty research reply"), club_name, website, country, cost_tracker)
+        
+        # Parse the research into sections
+        research_sections = self._parse_research_sections(full_research)
+        costs = cost_tracker.get_costs()
+        
+        if getattr(choice, 'finish_reason', None) == 'length':
+            print(f"⚠️ Research for {club_name} was cut short (output cap of {RESEARCH_MAX_COMPLETION_TOKENS} tokens or an interrupted stream); using it without saving")
+            research_sections['is_partial'] = True
+            return research_sections, costs
+        
+        # Save to CSV
+        self._save_research_to_csv(club_name, country or '', website or '', 
+                                 research_sections, full_research, costs)
+        
+        return research_sections, costs
+    
+    def _fallback_research(self, error: Exception, club_name: str, website: str, country: str,
+                           cost_tracker: CostTracker) -> Tuple[Dict, Dict]:
+        """Build fallback research when the O3 request fails (not saved, so the club is researched again next time)"""
+        print(f"Error researching club {club_name} with O3: {error}")
+        
+        # Create fallback research
+        fallback_sections = {
+            'introduction_research': f"Unable to find specific current information about {club_name} due to research limitations. General photography club activities assumed based on location: {country if country else 'Unknown region'}. Focus on general photography community support and learning more about their specific activities.",
+            'checkup_research': f"No specific upcoming events or challenges found for {club_name}. Suggest focusing on general photography season activities and mention common photography club needs and DxO benefits.",
+            'acceptance_research': f"No specific club structure information found for {club_name}. Assume standard photography club structure with leadership team. Recommend standard member communication approach and focus on general DxO software benefits for club members.",
+            'full_research_data': f"Research failed for {club_name}. Using fallback information.",
+            'from_cache': False,
+            'is_fallback': True
+        }
+        
+        return fallback_sections, cost_tracker.get_costs()
     
     def _parse_research_sections(self, full_research: str) -> Dict:
         """Parse the full research into three distinct sections"""
@@ -360,13 +962,13 @@ class ClubResearchManager:
         try:
             # Load existing research
             try:
-                research_df = pd.read_csv(self.research_csv_path)
+                research_df = read_research_csv(self.research_csv_path)
             except FileNotFoundError:
                 research_df = pd.DataFrame(columns=[
                     'club_name', 'country', 'website',
                     'introduction_research', 'checkup_research', 'acceptance_research',
                     'full_research_data', 'search_cost', 'web_search_cost', 'total_cost',
-                    'researched_at', 'expires_at', 'is_valid'
+                    'researched_at', 'expires_at', 'is_valid', 'research_key'
                 ])
             
             # Remove existing entry for this club
@@ -389,12 +991,14 @@ class ClubResearchManager:
                 'total_cost': costs.get('total_cost', 0.0),
                 'researched_at': researched_at.isoformat(),
                 'expires_at': expires_at.isoformat(),
-                'is_valid': True
+                'is_valid': True,
+                'research_key': research_cache_key(SEARCH_MODEL, club_name, country, website)
             }])
             
             # Add to research data
             research_df = pd.concat([research_df, new_entry], ignore_index=True)
-            research_df.to_csv(self.research_csv_path, index=False)
+            write_text_csv(research_df, self.research_csv_path)
+            self._research_mtime = None  # re-read on the next lookup even if the mtime didn't tick
             
             print(f"💾 Research saved for {club_name} (expires: {expires_at.strftime('%Y-%m-%d')})")
             print(f"💰 Research cost: ${costs.get('total_cost', 0.0):.4f}")
@@ -404,69 +1008,72 @@ class ClubResearchManager:
     
     def get_research_statistics(self) -> Dict:
         """Get statistics about research data"""
+        empty_stats = {
+            'total_researched_clubs': 0,
+            'valid_research_count': 0,
+            'expired_research_count': 0,
+            'total_research_cost': 0.0,
+            'total_search_cost': 0.0,
+            'total_web_search_cost': 0.0
+        }
+        
         try:
-            research_df = pd.read_csv(self.research_csv_path)
+            # Only the columns the stats need; research text columns are skipped entirely
+            research_df = pd.read_csv(
+                self.research_csv_path,
+                usecols=['expires_at'] + RESEARCH_COST_COLUMNS,
+                dtype={column: 'float64' for column in RESEARCH_COST_COLUMNS}
+            )
             
             if research_df.empty:
-                return {
-                    'total_researched_clubs': 0,
-                    'valid_research_count': 0,
-                    'expired_research_count': 0,
-                    'total_research_cost': 0.0
-                }
+                return empty_stats
             
             now = datetime.now()
-            research_df['is_currently_valid'] = research_df['expires_at'].apply(
-                lambda x: pd.to_datetime(x) > now
-            )
+            expires_at = pd.to_datetime(research_df['expires_at'], errors='coerce', format='ISO8601')
             
-            valid_count = research_df['is_currently_valid'].sum()
+            valid_count = int((expires_at > now).sum())
             expired_count = len(research_df) - valid_count
-            total_cost = research_df['total_cost'].sum()
+            cost_totals = research_df[RESEARCH_COST_COLUMNS].sum().to_dict()  # one reduction for all cost columns
             
             return {
                 'total_researched_clubs': len(research_df),
                 'valid_research_count': valid_count,
                 'expired_research_count': expired_count,
-                'total_research_cost': total_cost
+                'total_research_cost': cost_totals['total_cost'],
+                'total_search_cost': cost_totals['search_cost'],
+                'total_web_search_cost': cost_totals['web_search_cost']
             }
             
         except Exception as e:
             print(f"⚠️ Error getting research statistics: {e}")
-            return {
-                'total_researched_clubs': 0,
-                'valid_research_count': 0,
-                'expired_research_count': 0,
-                'total_research_cost': 0.0
-            }
+            return empty_stats
     
     def get_all_researched_clubs(self) -> List[Dict]:
         """Get list of all researched clubs with status"""
         try:
-            research_df = pd.read_csv(self.research_csv_path)
+            research_df = read_research_csv(self.research_csv_path)
             
             if research_df.empty:
                 return []
             
+            # Vectorized expiry columns instead of a per-row loop
             now = datetime.now()
-            result = []
+            expires_at = pd.to_datetime(research_df['expires_at'], errors='coerce', format='ISO8601')
+            is_valid = (expires_at > now).to_numpy()
+            days_left = (expires_at - now).dt.days.fillna(0).astype(int).to_numpy()
             
-            for _, row in research_df.iterrows():
-                expires_at = pd.to_datetime(row['expires_at'])
-                is_valid = expires_at > now
-                
-                result.append({
-                    'club_name': row['club_name'],
-                    'country': row['country'],
-                    'website': row['website'],
-                    'researched_at': row['researched_at'],
-                    'expires_at': row['expires_at'],
-                    'is_valid': is_valid,
-                    'days_until_expiry': (expires_at - now).days if is_valid else 0,
-                    'research_cost': row.get('total_cost', 0.0)
-                })
-            
-            return result
+            clubs_df = pd.DataFrame({
+                'club_name': research_df['club_name'],
+                'country': research_df['country'],
+                'website': research_df['website'],
+                'researched_at': research_df['researched_at'],
+                'expires_at': research_df['expires_at'],
+                'is_valid': is_valid,
+                'days_until_expiry': np.where(is_valid, days_left, 0),
+                'research_cost': research_df['total_cost'] if 'total_cost' in research_df else 0.0
+            })
+            
+            return clubs_df.to_dict('records')
             
         except Exception as e:
             print(f"⚠️ Error getting researched clubs: {e}")
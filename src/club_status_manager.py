@@ -1,5 +1,8 @@
 import pandas as pd
 import os
+import csv
+import atexit
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
@@ -19,6 +22,50 @@ class EmailType(Enum):
     CHECKUP = "checkup" 
     ACCEPTANCE = "acceptance"
 
+# Plain string values used in hot comparisons (avoids repeated enum attribute lookups)
+_SENT = ResponseStatus.EMAIL_SENT.value
+_POS = ResponseStatus.POSITIVE_RESPONSE.value
+_NEG = ResponseStatus.NEGATIVE_RESPONSE.value
+
+# Closed-set columns read as categoricals for the read-only reporting paths, so the
+# equality masks compare integer codes instead of Python strings
+_STATUS_CATEGORY = pd.CategoricalDtype([s.value for s in ResponseStatus])
+STATUS_REPORT_DTYPES = {
+    'introduction_status': _STATUS_CATEGORY,
+    'checkup_status': _STATUS_CATEGORY,
+    'acceptance_status': _STATUS_CATEGORY,
+    'current_stage': 'category',
+    'priority_level': 'category',
+}
+
+NOTIFICATION_FIELDS = [
+    'notification_id', 'club_name', 'email_type', 'notification_type',
+    'message', 'is_read', 'created_at', 'read_at'
+]
+
+# Single background writer shared by all instances: one worker keeps writes to the
+# same file in submission order, so mutating calls return before the disk catches up
+_csv_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='status-csv-writer')
+_pending_writes: Dict[str, Future] = {}
+atexit.register(_csv_writer.shutdown, wait=True)
+
+def _write_csv(df: pd.DataFrame, path: str):
+    try:
+        df.to_csv(path, index=False)
+    except Exception as e:
+        print(f"Error writing {path}: {e}")
+
+def _queue_csv_write(df: pd.DataFrame, path: str):
+    """Queue a full-file write of df to path on the background writer"""
+    # df is a frame the caller has finished with, so no defensive copy is needed
+    _pending_writes[path] = _csv_writer.submit(_write_csv, df, path)
+
+def _wait_for_writes(path: str):
+    """Block until every queued write to path has reached disk"""
+    future = _pending_writes.get(path)
+    if future is not None:
+        future.result()
+
 class ClubStatusManager:
     """Manages club statuses, responses, and notifications"""
     
@@ -67,16 +114,14 @@ class ClubStatusManager:
         
         # Initialize notifications CSV
         if not os.path.exists(self.notifications_csv_path):
-            notifications_df = pd.DataFrame(columns=[
-                'notification_id', 'club_name', 'email_type', 'notification_type',
-                'message', 'is_read', 'created_at', 'read_at'
-            ])
+            notifications_df = pd.DataFrame(columns=NOTIFICATION_FIELDS)
             notifications_df.to_csv(self.notifications_csv_path, index=False)
     
     def update_email_sent(self, club_name: str, email_type: str, notes: str = ""):
         """Update status when an email is sent"""
         try:
-            df = pd.read_csv(self.status_csv_path)
+            df = self._read_csv(self.status_csv_path)
+            now_iso = datetime.now().isoformat()
             
             # Find or create club record
             club_idx = df[df['club_name'] == club_name].index
@@ -86,23 +131,23 @@ class ClubStatusManager:
                     'club_name': club_name,
                     'current_stage': email_type,
                     'priority_level': 'medium',
-                    'created_at': datetime.now().isoformat(),
-                    'updated_at': datetime.now().isoformat(),
-                    'last_activity_date': datetime.now().isoformat()
+                    'created_at': now_iso,
+                    'updated_at': now_iso,
+                    'last_activity_date': now_iso
                 }
                 df = pd.concat([df, pd.DataFrame([new_record])], ignore_index=True)
                 club_idx = [len(df) - 1]
             
             # Update email sent information
             idx = club_idx[0]
-            df.loc[idx, f'{email_type}_sent_date'] = datetime.now().isoformat()
-            df.loc[idx, f'{email_type}_status'] = ResponseStatus.EMAIL_SENT.value
+            df.loc[idx, f'{email_type}_sent_date'] = now_iso
+            df.loc[idx, f'{email_type}_status'] = _SENT
             df.loc[idx, f'{email_type}_notes'] = notes
             df.loc[idx, 'current_stage'] = email_type
-            df.loc[idx, 'last_activity_date'] = datetime.now().isoformat()
-            df.loc[idx, 'updated_at'] = datetime.now().isoformat()
+            df.loc[idx, 'last_activity_date'] = now_iso
+            df.loc[idx, 'updated_at'] = now_iso
             
-            df.to_csv(self.status_csv_path, index=False)
+            _queue_csv_write(df, self.status_csv_path)
             
             # Create notification
             self._create_notification(
@@ -121,22 +166,23 @@ class ClubStatusManager:
     def record_response(self, club_name: str, email_type: str, response_type: str, notes: str = ""):
         """Record a response from a club"""
         try:
-            df = pd.read_csv(self.status_csv_path)
+            df = self._read_csv(self.status_csv_path)
             
             club_idx = df[df['club_name'] == club_name].index
             if len(club_idx) == 0:
                 return False
             
             idx = club_idx[0]
-            df.loc[idx, f'{email_type}_response_date'] = datetime.now().isoformat()
+            now_iso = datetime.now().isoformat()
+            df.loc[idx, f'{email_type}_response_date'] = now_iso
             df.loc[idx, f'{email_type}_response_type'] = response_type
             df.loc[idx, f'{email_type}_status'] = response_type
             df.loc[idx, f'{email_type}_notes'] = notes
-            df.loc[idx, 'last_activity_date'] = datetime.now().isoformat()
-            df.loc[idx, 'updated_at'] = datetime.now().isoformat()
+            df.loc[idx, 'last_activity_date'] = now_iso
+            df.loc[idx, 'updated_at'] = now_iso
             
             # Update current stage based on response
-            if response_type == ResponseStatus.POSITIVE_RESPONSE.value:
+            if response_type == _POS:
                 if email_type == 'introduction':
                     df.loc[idx, 'current_stage'] = 'checkup'
                 elif email_type == 'checkup':
@@ -144,11 +190,11 @@ class ClubStatusManager:
                 elif email_type == 'acceptance':
                     df.loc[idx, 'current_stage'] = 'partnership_active'
                 df.loc[idx, 'priority_level'] = 'high'
-            elif response_type == ResponseStatus.NEGATIVE_RESPONSE.value:
+            elif response_type == _NEG:
                 df.loc[idx, 'current_stage'] = 'not_interested'
                 df.loc[idx, 'priority_level'] = 'low'
             
-            df.to_csv(self.status_csv_path, index=False)
+            _queue_csv_write(df, self.status_csv_path)
             
             # Create notification for new response
             self._create_notification(
@@ -165,31 +211,52 @@ class ClubStatusManager:
             return False
     
     def _create_notification(self, club_name: str, email_type: str, notification_type: str, message: str):
-        """Create a new notification"""
+        """Create a new notification (appends one row without re-reading the file)"""
         try:
-            df = pd.read_csv(self.notifications_csv_path)
-            
+            now = datetime.now()
             new_notification = {
-                'notification_id': f"{club_name}_{email_type}_{notification_type}_{int(datetime.now().timestamp())}",
+                'notification_id': f"{club_name}_{email_type}_{notification_type}_{int(now.timestamp())}",
                 'club_name': club_name,
                 'email_type': email_type,
                 'notification_type': notification_type,
                 'message': message,
                 'is_read': False,
-                'created_at': datetime.now().isoformat(),
+                'created_at': now.isoformat(),
                 'read_at': None
             }
             
-            df = pd.concat([df, pd.DataFrame([new_notification])], ignore_index=True)
-            df.to_csv(self.notifications_csv_path, index=False)
+            # A queued rewrite would clobber the appended row, so let it land first
+            _wait_for_writes(self.notifications_csv_path)
+            with open(self.notifications_csv_path, 'a+', newline='', encoding='utf-8') as f:
+                # Follow the existing header so older files with a different column order stay aligned
+                f.seek(0)
+                header = next(csv.reader(f), None)
+                writer = csv.DictWriter(f, fieldnames=header or NOTIFICATION_FIELDS, extrasaction='ignore')
+                if not header:
+                    writer.writeheader()
+                writer.writerow(new_notification)
             
         except Exception as e:
             print(f"Error creating notification: {e}")
     
+    def _read_csv(self, path: str, **kwargs) -> pd.DataFrame:
+        """Read a tracking CSV after any queued writes to it have been flushed"""
+        _wait_for_writes(path)
+        return pd.read_csv(path, **kwargs)
+    
+    def flush(self):
+        """Wait for all queued status and notification writes to reach disk"""
+        _wait_for_writes(self.status_csv_path)
+        _wait_for_writes(self.notifications_csv_path)
+    
+    def _read_status_report(self) -> pd.DataFrame:
+        """Read the status CSV for reporting, with categorical status/stage columns"""
+        return self._read_csv(self.status_csv_path, dtype=STATUS_REPORT_DTYPES)
+    
     def get_club_status(self, club_name: str) -> Optional[Dict]:
         """Get complete status information for a club"""
         try:
-            df = pd.read_csv(self.status_csv_path)
+            df = self._read_csv(self.status_csv_path)
             club_data = df[df['club_name'] == club_name]
             
             if club_data.empty:
@@ -201,10 +268,21 @@ class ClubStatusManager:
             print(f"Error getting club status: {e}")
             return None
     
+    def get_club_stages(self) -> Dict[str, str]:
+        """Current stage of every tracked club from one read ({club_name: current_stage})"""
+        try:
+            df = self._read_csv(self.status_csv_path, usecols=['club_name', 'current_stage'])
+            # First row per club, as get_club_status returns
+            df = df.drop_duplicates(subset='club_name', keep='first')
+            return dict(zip(df['club_name'], df['current_stage'].fillna('new')))
+        except Exception as e:
+            print(f"Error getting club stages: {e}")
+            return {}
+    
     def get_clubs_by_status(self, email_type: str = None, status: str = None, stage: str = None) -> List[Dict]:
         """Get clubs filtered by status criteria"""
         try:
-            df = pd.read_csv(self.status_csv_path)
+            df = self._read_csv(self.status_csv_path)
             
             if df.empty:
                 return []
@@ -225,7 +303,7 @@ class ClubStatusManager:
     def get_unread_notifications(self) -> List[Dict]:
         """Get all unread notifications"""
         try:
-            df = pd.read_csv(self.notifications_csv_path)
+            df = self._read_csv(self.notifications_csv_path)
             unread = df[df['is_read'] == False].sort_values('created_at', ascending=False)
             return unread.to_dict('records')
             
@@ -236,14 +314,14 @@ class ClubStatusManager:
     def mark_notification_read(self, notification_id: str):
         """Mark a notification as read"""
         try:
-            df = pd.read_csv(self.notifications_csv_path)
+            df = self._read_csv(self.notifications_csv_path)
             
             notification_idx = df[df['notification_id'] == notification_id].index
             if len(notification_idx) > 0:
                 idx = notification_idx[0]
                 df.loc[idx, 'is_read'] = True
                 df.loc[idx, 'read_at'] = datetime.now().isoformat()
-                df.to_csv(self.notifications_csv_path, index=False)
+                _queue_csv_write(df, self.notifications_csv_path)
                 return True
             
             return False
@@ -255,7 +333,7 @@ class ClubStatusManager:
     def get_dashboard_stats(self) -> Dict:
         """Get statistics for the dashboard"""
         try:
-            df = pd.read_csv(self.status_csv_path)
+            df = self._read_status_report()
             
             if df.empty:
                 return {
@@ -270,24 +348,25 @@ class ClubStatusManager:
             
             stats = {
                 'total_clubs': len(df),
-                'introduction_sent': len(df[df['introduction_status'] == ResponseStatus.EMAIL_SENT.value]),
-                'checkup_sent': len(df[df['checkup_status'] == ResponseStatus.EMAIL_SENT.value]),
-                'acceptance_sent': len(df[df['acceptance_status'] == ResponseStatus.EMAIL_SENT.value]),
+                'introduction_sent': len(df[df['introduction_status'] == _SENT]),
+                'checkup_sent': len(df[df['checkup_status'] == _SENT]),
+                'acceptance_sent': len(df[df['acceptance_status'] == _SENT]),
                 'positive_responses': len(df[
-                    (df['introduction_status'] == ResponseStatus.POSITIVE_RESPONSE.value) |
-                    (df['checkup_status'] == ResponseStatus.POSITIVE_RESPONSE.value) |
-                    (df['acceptance_status'] == ResponseStatus.POSITIVE_RESPONSE.value)
+                    (df['introduction_status'] == _POS) |
+                    (df['checkup_status'] == _POS) |
+                    (df['acceptance_status'] == _POS)
                 ]),
                 'awaiting_response': len(df[
-                    (df['introduction_status'] == ResponseStatus.EMAIL_SENT.value) |
-                    (df['checkup_status'] == ResponseStatus.EMAIL_SENT.value) |
-                    (df['acceptance_status'] == ResponseStatus.EMAIL_SENT.value)
+                    (df['introduction_status'] == _SENT) |
+                    (df['checkup_status'] == _SENT) |
+                    (df['acceptance_status'] == _SENT)
                 ])
             }
             
             # Pipeline stages
             if 'current_stage' in df.columns:
-                stage_counts = df['current_stage'].value_counts().to_dict()
+                stage_counts = df['current_stage'].value_counts()
+                stage_counts = stage_counts[stage_counts > 0].to_dict()
                 stats['pipeline_stages'] = stage_counts
             else:
                 stats['pipeline_stages'] = {}
@@ -301,28 +380,39 @@ class ClubStatusManager:
     def get_clubs_needing_follow_up(self, days_since_sent: int = 7) -> List[Dict]:
         """Get clubs that need follow-up (no response after X days)"""
         try:
-            df = pd.read_csv(self.status_csv_path)
+            df = self._read_status_report()
             
             if df.empty:
                 return []
             
-            cutoff_date = datetime.now() - timedelta(days=days_since_sent)
+            now = datetime.now()
+            cutoff_date = now - timedelta(days=days_since_sent)
             follow_up_needed = []
+            email_types = ['introduction', 'checkup', 'acceptance']
+            
+            # Parse each sent-date column once; cache=True reuses results for repeated batch timestamps
+            parsed_dates = {
+                email_type: pd.to_datetime(df[f'{email_type}_sent_date'], errors='coerce', format='ISO8601', cache=True)
+                for email_type in email_types
+                if f'{email_type}_sent_date' in df.columns
+            }
             
-            for _, club in df.iterrows():
+            for i, (_, club) in enumerate(df.iterrows()):
                 # Check each email type for follow-up needs
-                for email_type in ['introduction', 'checkup', 'acceptance']:
-                    sent_date_col = f'{email_type}_sent_date'
+                for email_type in email_types:
+                    if email_type not in parsed_dates:
+                        continue
                     status_col = f'{email_type}_status'
+                    sent_ts = parsed_dates[email_type].iat[i]
                     
-                    if pd.notna(club.get(sent_date_col)) and club.get(status_col) == ResponseStatus.EMAIL_SENT.value:
-                        sent_date = datetime.fromisoformat(club[sent_date_col])
+                    if pd.notna(sent_ts) and club.get(status_col) == _SENT:
+                        sent_date = sent_ts.to_pydatetime()
                         if sent_date < cutoff_date:
                             follow_up_needed.append({
                                 'club_name': club['club_name'],
                                 'email_type': email_type,
                                 'sent_date': sent_date.isoformat(),
-                                'days_since_sent': (datetime.now() - sent_date).days
+                                'days_since_sent': (now - sent_date).days
                             })
             
             return follow_up_needed
@@ -0,0 +1,342 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, TYPE_CHECKING
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON for cache keys and the cache file when installed
+    orjson = None
+
+if TYPE_CHECKING:  # imported on first use; the openai package is slow to import
+    from openai.types.chat import ChatCompletion
+
+# Request fields that decide the completion; anything else (timeouts, headers) is ignored
+CACHE_KEY_FIELDS = ('model', 'messages', 'temperature', 'max_tokens', 'max_completion_tokens', 'stop', 'tools',
+                    'response_format')
+CACHED_COMPLETION_FINGERPRINT = 'completion-cache'
+
+
+def json_dumps(obj, sort_keys: bool = False) -> bytes:
+    """Compact UTF-8 JSON; matches orjson's output for request payloads, so cache keys survive installing it"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, sort_keys=sort_keys, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def json_loads(data):
+    """Parse JSON from bytes or str"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class CompletionCache:
+    """
+    Exact-match cache of chat completions with LRU eviction and a TTL.
+
+    Keys are the SHA-256 of the request fields in CACHE_KEY_FIELDS, so only
+    byte-identical requests are served from the cache. Entries are appended
+    to a JSON Lines file (one [key, entry] pair per line, later lines win) so
+    repeated dev/test runs share them; the file is compacted once superseded
+    lines outnumber the entries.
+    """
+
+    def __init__(self, cache_path: str, max_entries: int = 5000, ttl_seconds: int = 24 * 3600,
+                 allow_stochastic: bool = True):
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.allow_stochastic = allow_stochastic
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._file_lines = 0  # lines in the cache file, including superseded ones
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Load unexpired entries from disk (a null entry removes its key)"""
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'rb') as f:
+                lines = f.read().splitlines()
+            records = []
+            rewrite = False  # set when the file must be rewritten before it can be appended to
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    record = json_loads(line)
+                except ValueError:
+                    rewrite = True  # a line cut off by a crash mid-append
+                    continue
+                if not record or isinstance(record[0], list):
+                    # Files written before the cache was append-only hold one list of pairs
+                    records.extend(record)
+                    rewrite = True
+                else:
+                    records.append(record)
+            now = time.time()
+            for key, entry in records:
+                self._entries.pop(key, None)
+                if entry is not None and now - entry['stored_at'] < self.ttl_seconds:
+                    self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._file_lines = len(records)
+            if rewrite or self._file_lines > 2 * max(len(self._entries), 1):
+                self._save()
+        except Exception as e:
+            print(f"⚠️ Could not load completion cache: {e}")
+
+    def _append(self, key: str, entry: Optional[Dict]):
+        """Append one [key, entry] line; compact the file once it is mostly superseded lines"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            with open(self.cache_path, 'ab') as f:
+                f.write(json_dumps([key, entry]) + b'\n')
+            self._file_lines += 1
+            if self._file_lines > 2 * max(len(self._entries), self.max_entries // 2, 1):
+                self._save()
+        except Exception as e:
+            print(f"⚠️ Could not save completion cache: {e}")
+
+    def _save(self):
+        """Atomically rewrite the cache file with only the live entries (oldest first)"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.writelines(json_dumps([key, entry]) + b'\n' for key, entry in self._entries.items())
+            os.replace(tmp_path, self.cache_path)
+            self._file_lines = len(self._entries)
+        except Exception as e:
+            print(f"⚠️ Could not save completion cache: {e}")
+
+    @staticmethod
+    def make_key(request: Dict) -> str:
+        """SHA-256 of the request fields that determine the completion"""
+        key_data = {field: request.get(field) for field in CACHE_KEY_FIELDS}
+        return hashlib.sha256(json_dumps(key_data, sort_keys=True)).hexdigest()
+
+    def is_cacheable(self, request: Dict) -> bool:
+        """Sampled requests (temperature > 0, the API default) are only cached when allowed"""
+        return self.allow_stochastic or request.get('temperature', 1.0) == 0
+
+    def get(self, request: Dict) -> Optional['ChatCompletion']:
+        """Return a zero-usage copy of the cached completion, or None"""
+        if not self.is_cacheable(request):
+            return None
+
+        key = self.make_key(request)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.time() - entry['stored_at'] >= self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        from openai.types.chat import ChatCompletion
+        
+        # Zero usage so CostTracker records the hit at $0
+        return ChatCompletion.model_validate({
+            'id': f"cached-{key[:16]}",
+            'object': 'chat.completion',
+            'created': int(entry['stored_at']),
+            'model': entry['model'],
+            'system_fingerprint': CACHED_COMPLETION_FINGERPRINT,
+            'choices': [{
+                'index': 0,
+                'finish_reason': entry.get('finish_reason') or 'stop',
+                'message': {'role': 'assistant', 'content': entry['content']}
+            }],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+        })
+
+    def put(self, request: Dict, response):
+        """Remember a completion, evicting the least recently used entries"""
+        if not self.is_cacheable(request):
+            return
+
+        try:
+            choice = response.choices[0]
+            entry = {
+                'model': getattr(response, 'model', None) or request.get('model'),
+                'content': choice.message.content,
+                'finish_reason': getattr(choice, 'finish_reason', None),
+                'stored_at': time.time()
+            }
+        except Exception as e:
+            print(f"⚠️ Could not cache completion: {e}")
+            return
+        if entry['finish_reason'] == 'length':
+            return  # cut off at the token cap; a retry may do better
+
+        with self._lock:
+            key = self.make_key(request)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._append(key, entry)
+
+    def discard(self, request: Dict):
+        """Forget the completion for a request (e.g. a reply that failed validation)"""
+        with self._lock:
+            key = self.make_key(request)
+            if self._entries.pop(key, None) is not None:
+                self._append(key, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process"""
+        return {'cache_hits': self.hits, 'cache_misses': self.misses, 'entries': len(self._entries)}
+
+
+@lru_cache(maxsize=None)
+def get_completion_cache(cache_path: str, max_entries: int = 5000, ttl_seconds: int = 24 * 3600,
+                         allow_stochastic: bool = True) -> CompletionCache:
+    """One shared cache per file, so research and content managers don't overwrite each other"""
+    return CompletionCache(cache_path, max_entries, ttl_seconds, allow_stochastic)
+
+
+def is_cached_completion(response) -> bool:
+    """True if the response was served from a CompletionCache"""
+    return getattr(response, 'system_fingerprint', None) == CACHED_COMPLETION_FINGERPRINT
+
+
+class StreamedCompletion:
+    """Accumulates streamed chat chunks into one ChatCompletion"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.parts = []
+        self.finish_reason = None
+        self.usage = None
+        self.started = time.time()
+
+    @property
+    def content(self) -> str:
+        return ''.join(self.parts)
+
+    def add(self, chunk):
+        """Take one chunk; the usage-only chunk at the end has no choices"""
+        if getattr(chunk, 'usage', None):
+            self.usage = chunk.usage.model_dump()
+        if not chunk.choices:
+            return
+        choice = chunk.choices[0]
+        if choice.delta and choice.delta.content:
+            if not self.parts:
+                print(f"📡 {self.model} streaming (first tokens after {time.time() - self.started:.1f}s)")
+            self.parts.append(choice.delta.content)
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+
+    def to_completion(self, finish_reason: str = None) -> 'ChatCompletion':
+        from openai.types.chat import ChatCompletion
+        
+        return ChatCompletion.model_validate({
+            'id': f"stream-{int(self.started)}",
+            'object': 'chat.completion',
+            'created': int(self.started),
+            'model': self.model,
+            'choices': [{
+                'index': 0,
+                'finish_reason': finish_reason or self.finish_reason or 'stop',
+                'message': {'role': 'assistant', 'content': self.content}
+            }],
+            'usage': self.usage
+        })
+
+    def partial(self, error: Exception) -> 'ChatCompletion':
+        """The text received before the stream broke, marked as truncated; re-raise if there is none"""
+        if not self.parts:
+            raise error
+        print(f"⚠️ {self.model} stream interrupted after {len(self.content)} characters ({error}); using the partial response")
+        return self.to_completion(finish_reason='length')
+
+
+def cached_chat_completion(client, cache: Optional[CompletionCache], **kwargs):
+    """client.chat.completions.create(**kwargs), served from the cache when possible"""
+    if cache is None:
+        return client.chat.completions.create(**kwargs)
+
+    cached = cache.get(kwargs)
+    if cached is not None:
+        print(f"⚡ Completion cache hit ({kwargs.get('model')})")
+        return cached
+
+    response = client.chat.completions.create(**kwargs)
+    cache.put(kwargs, response)
+    return response
+
+
+async def cached_chat_completion_async(client, cache: Optional[CompletionCache], **kwargs):
+    """Async variant of cached_chat_completion for an AsyncOpenAI client"""
+    if cache is None:
+        return await client.chat.completions.create(**kwargs)
+
+    cached = cache.get(kwargs)
+    if cached is not None:
+        print(f"⚡ Completion cache hit ({kwargs.get('model')})")
+        return cached
+
+    response = await client.chat.completions.create(**kwargs)
+    cache.put(kwargs, response)
+    return response
+
+
+def stream_chat_completion(client, cache: Optional[CompletionCache], **kwargs):
+    """
+    Like cached_chat_completion, but streams the response and assembles it into one ChatCompletion.
+
+    Tokens arrive as they are generated, and if the connection drops mid-answer the text received
+    so far is returned (finish_reason 'length') instead of nothing. Partial answers are not cached.
+    """
+    if cache is not None:
+        cached = cache.get(kwargs)
+        if cached is not None:
+            print(f"⚡ Completion cache hit ({kwargs.get('model')})")
+            return cached
+
+    streamed = StreamedCompletion(kwargs.get('model'))
+    try:
+        for chunk in client.chat.completions.create(stream=True, stream_options={'include_usage': True}, **kwargs):
+            streamed.add(chunk)
+    except Exception as e:
+        return streamed.partial(e)
+
+    response = streamed.to_completion()
+    if cache is not None:
+        cache.put(kwargs, response)
+    return response
+
+
+async def stream_chat_completion_async(client, cache: Optional[CompletionCache], **kwargs):
+    """Async variant of stream_chat_completion for an AsyncOpenAI client"""
+    if cache is not None:
+        cached = cache.get(kwargs)
+        if cached is not None:
+            print(f"⚡ Completion cache hit ({kwargs.get('model')})")
+            return cached
+
+    streamed = StreamedCompletion(kwargs.get('model'))
+    try:
+        stream = await client.chat.completions.create(stream=True, stream_options={'include_usage': True}, **kwargs)
+        async for chunk in stream:
+            streamed.add(chunk)
+    except Exception as e:
+        return streamed.partial(e)
+
+    response = streamed.to_completion()
+    if cache is not None:
+        cache.put(kwargs, response)
+    return response
@@ -1,4 +1,6 @@
 import os
+from functools import lru_cache
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -14,10 +16,13 @@ else:
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 SEARCH_MODEL = os.getenv('SEARCH_MODEL', 'o3')  # O3 for web search research
 CONTENT_MODEL = os.getenv('CONTENT_MODEL', 'gpt-4.1-nano')  # GPT-4.1-nano for content generation
+EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'text-embedding-3-small')  # Embeddings for the semantic cache
+CONTENT_PACK_SIZE = int(os.getenv('CONTENT_PACK_SIZE', '8'))  # Clubs per request when content generation is packed
 
 # CSV Configuration - check multiple possible paths
+@lru_cache(maxsize=None)
 def _find_csv_path(filename: str) -> str:
-    """Find CSV file in multiple possible locations"""
+    """Find CSV file in multiple possible locations (resolved once per filename)"""
     possible_paths = [
         filename,  # Current directory
         f"../{filename}",  # Parent directory
@@ -31,7 +36,7 @@ def _find_csv_path(filename: str) -> str:
     # Return default if not found
     return filename
 
-CLUBS_CSV_PATH = os.getenv('CLUBS_CSV_PATH', _find_csv_path('test_results_20250701_092437.csv'))
+CLUBS_CSV_PATH = os.getenv('CLUBS_CSV_PATH') or _find_csv_path('test_results_20250701_092437.csv')
 CLUBS_RESEARCH_CSV_PATH = _find_csv_path('club_research_results.csv')
 
 # Email Template Configuration
@@ -40,23 +45,60 @@ EMAIL_TEMPLATE_PATH = os.getenv('EMAIL_TEMPLATE_PATH', 'Introduction Email')
 # Database Configuration
 DATABASE_PATH = os.getenv('DATABASE_PATH', 'email_tracking.db')
 
+# Concurrent email generation - clubs in flight at once (keep inside the account's rate limits)
+GENERATION_CONCURRENCY = int(os.getenv('GENERATION_CONCURRENCY', '16'))
+# Auto-research calls in flight at once during concurrent generation (O3 web search is slow and rate-limited)
+RESEARCH_CONCURRENCY = int(os.getenv('RESEARCH_CONCURRENCY', '4'))
+
+# Research output cap - bounds billed O3 output (for reasoning models this includes reasoning tokens)
+RESEARCH_MAX_COMPLETION_TOKENS = int(os.getenv('RESEARCH_MAX_COMPLETION_TOKENS', '4000'))
+
+# Stream research responses - progress as tokens arrive and partial output if the connection drops
+# (off by default: streaming o3 needs a verified OpenAI organization, set RESEARCH_STREAM=true if yours is)
+RESEARCH_STREAM = os.getenv('RESEARCH_STREAM', 'false').lower() in ('1', 'true', 'yes')
+
+# Parse the research and tracking CSVs with pyarrow when it is installed (set false to force pandas)
+USE_ARROW_CSV = os.getenv('USE_ARROW_CSV', 'true').lower() in ('1', 'true', 'yes')
+
+# Semantic Cache Configuration - reuse research for near-identical prompts (off by default)
+SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+SEMANTIC_CACHE_PATH = os.getenv('SEMANTIC_CACHE_PATH', 'semantic_cache.db')
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.92'))
+# Also reuse generated email content across clubs with near-identical research (off by default, separate from research reuse)
+SEMANTIC_CONTENT_CACHE_ENABLED = os.getenv('SEMANTIC_CONTENT_CACHE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+
+# Exact-match completion cache - replays identical requests for free during dev/testing (off by default)
+COMPLETION_CACHE_ENABLED = os.getenv('COMPLETION_CACHE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+COMPLETION_CACHE_PATH = os.getenv('COMPLETION_CACHE_PATH', os.path.join(os.path.expanduser('~'), '.cache', 'dxo_personalizer', 'completions.json'))
+COMPLETION_CACHE_MAX_ENTRIES = int(os.getenv('COMPLETION_CACHE_MAX_ENTRIES', '5000'))
+COMPLETION_CACHE_TTL_SECONDS = int(os.getenv('COMPLETION_CACHE_TTL_SECONDS', str(24 * 3600)))
+ALLOW_STOCHASTIC_CACHE = os.getenv('ALLOW_STOCHASTIC_CACHE', 'true').lower() in ('1', 'true', 'yes')  # Also cache temperature > 0 requests
+
 # Streamlit Configuration
 APP_TITLE = "Photo Club Email Personalization Tool"
 APP_DESCRIPTION = "Generate personalized emails for photography clubs using AI with cost tracking"
 
 # Cost Tracking Configuration (pricing per 1M tokens)
-PRICING = {
-    'o3': {
+# Read-only so a stray assignment can't skew cost calculations at runtime
+PRICING = MappingProxyType({
+    'o3': MappingProxyType({
         'input': 2.00,           # $2.00 per 1M tokens
         'cached_input': 0.50,    # $0.50 per 1M cached tokens
         'output': 8.00           # $8.00 per 1M tokens
-    },
-    'gpt-4.1-nano': {
+    }),
+    'gpt-4.1-nano': MappingProxyType({
         'input': 0.100,          # $0.100 per 1M tokens
         'cached_input': 0.025,   # $0.025 per 1M cached tokens
         'output': 0.400          # $0.400 per 1M tokens
-    }
-}
+    }),
+    'text-embedding-3-small': MappingProxyType({
+        'input': 0.020,          # $0.020 per 1M tokens
+        'output': 0.0            # Embeddings have no output tokens
+    })
+})
+
+# OpenAI Batch API requests are billed at half the synchronous token price
+BATCH_DISCOUNT = 0.5
 
 # Web Search Tool Cost for O3 models
 WEB_SEARCH_COST_PER_1K_CALLS = 10.00  # $10.00 per 1K calls
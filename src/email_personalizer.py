@@ -1,53 +1,300 @@
-import openai
 import pandas as pd
 import os
+import logging
+import re
+import csv
+import atexit
+import asyncio
+from collections import namedtuple
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
+from functools import lru_cache
 import json
-from typing import Dict, Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List, TYPE_CHECKING
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.config import *
-from src.club_research_manager import ClubResearchManager
+from src.semantic_cache import SemanticCache
+from src.completion_cache import get_completion_cache, cached_chat_completion, cached_chat_completion_async
+from src.club_research_manager import ClubResearchManager, read_clubs_csv, read_text_csv, write_text_csv, read_research_csv, first_row_per_club, get_openai_client, get_async_openai_client, get_cached_tokens, log_prompt_cache_ratio, submit_chat_batch, fetch_chat_batch, wait_for_chat_batch, log_batch_token_cost
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:  # openai takes ~0.5s to import, so it is only imported once a client is needed
+    import openai
+
+TRACKING_FIELDS = (
+    'club_name', 'email_type', 'email_sent_date', 'personalized_content',
+    'generated_email', 'content_cost', 'total_cost', 'created_at'
+)
+# Read as plain strings so ISO dates aren't converted to timestamps by pyarrow
+TRACKING_TEXT_FIELDS = ('club_name', 'email_type', 'email_sent_date', 'personalized_content', 'generated_email', 'created_at')
+TRACKING_COST_FIELDS = ('content_cost', 'total_cost')
+COST_DECIMALS = 8  # costs are stored as fixed-point dollars; running totals count 1e-8 dollar units
+COST_SCALE = 10 ** COST_DECIMALS
+TRACKING_COMPACT_EVERY = 100  # appended saves between automatic compactions
+TRACKING_FLUSH_EVERY = 256  # rows buffered by bulk_run() before they are flushed to disk
+
+# Stands in for the club name in content stored in the semantic cache
+CLUB_NAME_PLACEHOLDER = '{{club_name}}'
+
+# Where a template wants the personalized paragraph; templates without it fall back to anchor searches
+PERSONALIZATION_PLACEHOLDER = '{{personalized_content}}'
+
+# Killian's introduction line, then the point to insert at: before "We're offering" if it
+# follows, otherwise the next paragraph break. One left-to-right scan finds both.
+_INTRO_INSERT_RE = re.compile(
+    r"(?P<killian>" + re.escape("I'm Killian, part of the Partnerships team at DxO Labs, the creators of award-winning photo editing software like DxO PhotoLab and Nik Collection.") + r")"
+    r"(?:(?P<offer>.*?)(?=\n\nWe're offering)|(?P<paragraph>.*?)(?=\n\n))",
+    re.DOTALL
+)
+
+# Research column (and research_club_with_o3 section) used for each email type
+RESEARCH_COLUMNS = {
+    'introduction': 'introduction_research',
+    'checkup': 'checkup_research',
+    'acceptance': 'acceptance_research'
+}
+
+# Result of one research store lookup: whether the club has a row, the section for the
+# email type (None if missing or expired) and whether the row has expired
+_ResearchLookup = namedtuple('_ResearchLookup', 'found data expired')
+
+# Template file per email type, looked up under <project root>/templates first
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_FILES = {
+    'introduction': 'introduction_email_template.txt',
+    'checkup': 'checkup_email_template.txt',
+    'acceptance': 'acceptance_email_template.txt'
+}
+
+# Tracking files that have been appended to, compacted once more at exit
+_tracking_csvs_to_compact = set()
+
+
+def read_tracking_csv(tracking_csv_path: str) -> pd.DataFrame:
+    """Read the tracking CSV (pyarrow's multi-threaded parser when it is installed)"""
+    return read_text_csv(tracking_csv_path, TRACKING_TEXT_FIELDS, TRACKING_COST_FIELDS)
+
+
+def format_cost(cost) -> str:
+    """Dollar amount as fixed-point text ('0.013265'), not a full float repr ('0.013264999999999999')"""
+    return f"{float(cost or 0.0):.{COST_DECIMALS}f}".rstrip('0').rstrip('.') or '0'
+
+
+def _compact_tracking_file(tracking_csv_path: str) -> int:
+    """Keep only the latest row per (club_name, email_type); returns rows dropped"""
+    tracking_df = read_tracking_csv(tracking_csv_path)
+    compacted_df = tracking_df.drop_duplicates(subset=['club_name', 'email_type'], keep='last')
+    dropped = len(tracking_df) - len(compacted_df)
+    if dropped:
+        compacted_df = compacted_df.assign(**{
+            field: compacted_df[field].map(format_cost, na_action='ignore')
+            for field in TRACKING_COST_FIELDS if field in compacted_df
+        })
+        tmp_path = f"{tracking_csv_path}.tmp"
+        write_text_csv(compacted_df, tmp_path)
+        os.replace(tmp_path, tracking_csv_path)
+    return dropped
+
+
+def _compact_tracking_csvs_at_exit():
+    for tracking_csv_path in list(_tracking_csvs_to_compact):
+        try:
+            _compact_tracking_file(tracking_csv_path)
+        except Exception as e:
+            print(f"⚠️ Error compacting {tracking_csv_path}: {e}")
+
+
+atexit.register(_compact_tracking_csvs_at_exit)
+
+# Email type specific prompt context
+EMAIL_CONTEXTS = {
+    'introduction': {
+        'context': 'This is the FIRST email we\'re sending to this club. We are introducing ourselves and offering a discount for DxO products to their members.',
+        'focus': 'catching their attention with recent achievements and specialties',
+        'tone': 'professional and confident - this is our first impression'
+    },
+    'checkup': {
+        'context': 'This is a FOLLOW-UP email because they didn\'t respond to our introduction. We need to create urgency and show value.',
+        'focus': 'upcoming events, deadlines, and time-sensitive opportunities',
+        'tone': 'friendly but urgent - showing we understand their needs'
+    },
+    'acceptance': {
+        'context': 'This email is sent when they ACCEPT our offer. We need to explain how the discount process works.',
+        'focus': 'club structure, member communication, and discount implementation',
+        'tone': 'helpful and instructional - guiding them through the process'
+    }
+}
+
+_SPECIALIST_ROLE = "You are a professional marketing specialist for DxO Labs creating personalized content for photography club {email_type} emails. Generate ONLY the requested personalized sentences that show genuine knowledge of the club and connect to DxO software benefits. Do not include any email template or other content."
+_CLUB_INPUT_NOTE = "The user message gives the club name (CLUB) and the research gathered about it (CLUB RESEARCH)."
+
+# Static system prompts, built once at import so every call sends a byte-identical prefix
+# (OpenAI prompt caching, routed per email type with prompt_cache_key); only the club name
+# and research vary, in the user message.
+CONTENT_SYSTEM_PROMPTS = {
+    'introduction': f"""{_SPECIALIST_ROLE.format(email_type='introduction')}
+
+You are writing a personalized addition for a professional marketing email from DxO Labs to a photography club. {_CLUB_INPUT_NOTE}
+
+**EMAIL TYPE: INTRODUCTION EMAIL**
+**CONTEXT:** {EMAIL_CONTEXTS['introduction']['context']}
+
+**YOUR TASK:**
+Generate ONLY 1-2 personalized sentences that will be inserted after this line in the email:
+"I'm Killian, part of the Partnerships team at DxO Labs, the creators of award-winning photo editing software like DxO PhotoLab and Nik Collection."
+
+**REQUIREMENTS:**
+- Start with "I read about..." or "I came across..." or "I noticed..." or "I was impressed by..."
+- Reference specific research findings about the club
+- Focus on {EMAIL_CONTEXTS['introduction']['focus']}
+- Connect to DxO's software benefits naturally for their specific photography focus
+- Be {EMAIL_CONTEXTS['introduction']['tone']}
+- Maximum 2 sentences
+- Return ONLY the personalized sentences, nothing else
+
+**EXAMPLE OUTPUT:**
+"I read about your recent 'Urban Nights' exhibition and was impressed by the technical challenges your members tackled with low-light street photography. I believe DxO PhotoLab's industry-leading noise reduction could help your photographers push those ISO limits even further."
+
+**GENERATE ONLY THE PERSONALIZED SENTENCES FOR INTRODUCTION EMAIL.**""",
+
+    'checkup': f"""{_SPECIALIST_ROLE.format(email_type='checkup')}
+
+You are writing a personalized addition for a follow-up email from DxO Labs to a photography club that didn't respond to the initial offer. {_CLUB_INPUT_NOTE}
+
+**EMAIL TYPE: CHECKUP/FOLLOW-UP EMAIL**
+**CONTEXT:** {EMAIL_CONTEXTS['checkup']['context']}
+
+**YOUR TASK:**
+Generate ONLY 1-2 personalized sentences that will be inserted after the greeting in a follow-up email.
+
+**REQUIREMENTS:**
+- Reference upcoming events, deadlines, or time-sensitive opportunities from research
+- Create urgency but remain friendly
+- Show you understand their current activities and needs
+- Connect timing to when DxO tools would be most valuable
+- Be {EMAIL_CONTEXTS['checkup']['tone']}
+- Maximum 2 sentences
+- Return ONLY the personalized sentences, nothing else
+
+**EXAMPLE OUTPUT:**
+"I noticed you have your annual photography competition coming up in March and thought this might be perfect timing. Many clubs find DxO tools especially valuable when members are preparing their best work for competitions."
+
+**GENERATE ONLY THE PERSONALIZED SENTENCES FOR CHECKUP EMAIL.**""",
+
+    'acceptance': f"""{_SPECIALIST_ROLE.format(email_type='acceptance')}
+
+You are writing a personalized addition for an acceptance email from DxO Labs to a photography club that has shown interest in the partnership. {_CLUB_INPUT_NOTE}
+
+**EMAIL TYPE: ACCEPTANCE/PARTNERSHIP EMAIL**
+**CONTEXT:** {EMAIL_CONTEXTS['acceptance']['context']}
+
+**YOUR TASK:**
+Generate ONLY 1-2 personalized sentences that acknowledge their club structure and show understanding of how they communicate with members.
+
+**REQUIREMENTS:**
+- Reference their club size, organization, or communication methods from research
+- Show understanding of how they handle member benefits
+- Acknowledge their community or leadership structure
+- Be {EMAIL_CONTEXTS['acceptance']['tone']}
+- Maximum 2 sentences
+- Return ONLY the personalized sentences, nothing else
+
+**EXAMPLE OUTPUT:**
+"I understand you have about 50 active members and typically share benefits through your monthly newsletter. This partnership structure should work perfectly with your existing member communication process."
+
+**GENERATE ONLY THE PERSONALIZED SENTENCES FOR ACCEPTANCE EMAIL.**""",
+
+    'default': f"""{_SPECIALIST_ROLE.format(email_type='introduction')}
+
+You are writing a personalized addition for a professional marketing email from DxO Labs to a photography club. {_CLUB_INPUT_NOTE}
+
+**YOUR TASK:**
+Generate ONLY 1-2 personalized sentences referencing specific research findings about the club.
+
+**REQUIREMENTS:**
+- Reference specific research findings
+- Connect to DxO's software benefits
+- Maximum 2 sentences
+- Return ONLY the personalized sentences, nothing else
+
+**GENERATE PERSONALIZED CONTENT.**"""
+}
+
+
+# Appended to the system prompt when several clubs are packed into one request
+PACKED_CONTENT_INSTRUCTIONS = """
+
+**MULTIPLE CLUBS:**
+The user message contains several clubs, each in its own block starting with "CLUB:" and separated by "---". Write the personalized sentences for each club separately, using only that club's research.
+Respond with a JSON object of the form {"emails": [{"club": "<club name exactly as given>", "personalized": "<the personalized sentences>"}]} with one entry per club."""
+
+PACKED_CONTENT_SYSTEM_PROMPTS = {
+    email_type: system_prompt + PACKED_CONTENT_INSTRUCTIONS
+    for email_type, system_prompt in CONTENT_SYSTEM_PROMPTS.items()
+}
+
+# Single-club content requests: a low temperature keeps the 1-2 sentences on-brief, and
+# structured outputs return them in one JSON field with no preamble for us to strip
+CONTENT_TEMPERATURE = 0.4
+CONTENT_MAX_TOKENS = 200
+CONTENT_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "Sentences",
+        "strict": False,  # strict mode rejects maxLength; replies are validated by _parse_content_sentences instead
+        "schema": {
+            "type": "object",
+            "properties": {"sentences": {"type": "string", "maxLength": 500}},
+            "required": ["sentences"],
+            "additionalProperties": False
+        }
+    }
+}
+
 
 class CostTracker:
     """Track costs for different AI models and operations"""
     
-    def __init__(self):
+    def __init__(self, batch_discount: float = 1.0):
+        # Web search is billed inside the research costs added by add_research_cost
         self.costs = {
             'search_cost': 0.0,
             'content_cost': 0.0,
-            'web_search_cost': 0.0,
             'total_cost': 0.0
         }
+        # Token price multiplier; BATCH_DISCOUNT for requests sent through the Batch API
+        self.batch_discount = batch_discount
     
     def calculate_token_cost(self, model: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> float:
         """Calculate cost based on token usage including cached tokens"""
-        if model not in PRICING:
-            print(f"⚠️ Warning: Model '{model}' not found in pricing configuration")
+        prices = PRICING.get(model)
+        if prices is None:
+            logger.warning("Model '%s' not found in pricing configuration", model)
             return 0.0
         
-        # Calculate regular input cost (exclude cached tokens from regular input)
-        regular_input_tokens = max(0, input_tokens - cached_tokens)
-        input_cost = (regular_input_tokens / 1_000_000) * PRICING[model]['input']
-        
-        # Calculate cached input cost if applicable
-        cached_cost = 0.0
-        if cached_tokens > 0 and 'cached_input' in PRICING[model]:
-            cached_cost = (cached_tokens / 1_000_000) * PRICING[model]['cached_input']
+        # Per-token prices, looked up once
+        input_price = prices['input'] / 1_000_000
+        cached_price = prices.get('cached_input', 0.0) / 1_000_000
+        output_price = prices['output'] / 1_000_000
         
-        # Calculate output cost
-        output_cost = (output_tokens / 1_000_000) * PRICING[model]['output']
+        # Cached tokens are billed at the cached rate instead of the regular input rate
+        regular_input_tokens = max(0, input_tokens - cached_tokens)
+        input_cost = regular_input_tokens * input_price
+        cached_cost = cached_tokens * cached_price if cached_tokens > 0 else 0.0
+        output_cost = output_tokens * output_price
         
-        total_cost = input_cost + cached_cost + output_cost
+        total_cost = (input_cost + cached_cost + output_cost) * self.batch_discount
         
-        # Log detailed token usage and costs
-        print(f"📊 Token Usage for {model}:")
-        print(f"   Input tokens: {input_tokens:,}")
-        print(f"   Regular input tokens: {regular_input_tokens:,} (${input_cost:.6f})")
-        if cached_tokens > 0:
-            print(f"   Cached input tokens: {cached_tokens:,} (${cached_cost:.6f})")
-        print(f"   Output tokens: {output_tokens:,} (${output_cost:.6f})")
-        print(f"   Total cost: ${total_cost:.6f}")
+        # Detailed breakdown only when debug logging is on (e.g. research_cli.py --verbose)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Token usage for %s: input %s (regular %s = $%.6f, cached %s = $%.6f), output %s = $%.6f, "
+                "batch discount x%s, total $%.6f",
+                model, f"{input_tokens:,}", f"{regular_input_tokens:,}", input_cost, f"{cached_tokens:,}", cached_cost,
+                f"{output_tokens:,}", output_cost, self.batch_discount, total_cost
+            )
         
         return total_cost
     
@@ -57,6 +304,18 @@ class CostTracker:
         self.costs['content_cost'] += cost
         self.costs['total_cost'] += cost
     
+    def add_embedding_cost(self, input_tokens: int):
+        """Add cost for embedding club research for the semantic content cache"""
+        cost = self.calculate_token_cost(EMBEDDING_MODEL, input_tokens, 0)
+        self.costs['content_cost'] += cost
+        self.costs['total_cost'] += cost
+    
+    def add_research_cost(self, research_costs: Dict[str, float]):
+        """Add the total of a ClubResearchManager research call (tokens and web search) as search cost"""
+        cost = research_costs.get('total_cost', 0.0)
+        self.costs['search_cost'] += cost
+        self.costs['total_cost'] += cost
+    
     def get_costs(self) -> Dict[str, float]:
         """Get all tracked costs"""
         return self.costs.copy()
@@ -71,49 +330,77 @@ class EmailPersonalizer:
         if not OPENAI_API_KEY:
             raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in environment variables or .env file")
         
-        try:
-            self.openai_client = openai.OpenAI(
-                api_key=OPENAI_API_KEY,
-                timeout=60.0,
-                max_retries=3,
-            )
-        except Exception as e:
-            raise ValueError(f"Failed to initialize OpenAI client: {e}")
+        # Clients are created (and openai imported) on first use, so CSV-only commands start quickly
+        self._openai_client = None
+        self._async_client = None
         
         self.tracking_csv_path = 'sent_emails_tracking.csv'
         self.research_csv_path = CLUBS_RESEARCH_CSV_PATH
         self.research_manager = ClubResearchManager()
+        self.completion_cache = get_completion_cache(
+            COMPLETION_CACHE_PATH, COMPLETION_CACHE_MAX_ENTRIES, COMPLETION_CACHE_TTL_SECONDS, ALLOW_STOCHASTIC_CACHE
+        ) if COMPLETION_CACHE_ENABLED else None
+        self._saves_since_compaction = 0
+        self._tracking_file = None  # append handle kept open by bulk_run()
+        self._pending_tracking_rows: List[Dict] = []  # rows bulk_run() has not written yet
+        self._content_semantic_caches: Dict[str, SemanticCache] = {}  # email_type -> cache
+        
+        # File-backed caches, refreshed when the file's mtime changes
+        self._clubs_df = None
+        self._clubs_mtime = None
+        self._clubs_by_name: Dict[str, Dict] = {}
+        self._template_cache: Dict[str, Tuple[str, float, str]] = {}  # email_type -> (path, mtime, content)
+        
         self._initialize_tracking_csv()
+        self._tracking_stamp = None  # tracking CSV stamp the index was read at
+        self._sent_index: Dict[Tuple[str, str], Dict] = {}
+        self._email_totals = self._sum_email_totals()
+        self._get_sent_index()
         
+    @property
+    def openai_client(self) -> 'openai.OpenAI':
+        """Shared OpenAI client (unless one was assigned)"""
+        return self._openai_client or get_openai_client()
+    
+    @openai_client.setter
+    def openai_client(self, client: 'openai.OpenAI'):
+        self._openai_client = client
+    
+    @property
+    def async_client(self) -> 'openai.AsyncOpenAI':
+        """Shared AsyncOpenAI client for the running event loop (unless one was assigned)"""
+        return self._async_client or get_async_openai_client()
+    
+    @async_client.setter
+    def async_client(self, client: 'openai.AsyncOpenAI'):
+        self._async_client = client
+    
     def _initialize_tracking_csv(self):
         """Initialize CSV file to track sent emails and costs"""
         if not os.path.exists(self.tracking_csv_path):
-            tracking_df = pd.DataFrame(columns=[
-                'club_name', 'email_type', 'email_sent_date', 'personalized_content', 
-                'generated_email', 'content_cost', 'total_cost', 'created_at'
-            ])
-            tracking_df.to_csv(self.tracking_csv_path, index=False)
+            with open(self.tracking_csv_path, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f, lineterminator='\n').writerow(TRACKING_FIELDS)
     
     def load_clubs_data(self) -> pd.DataFrame:
-        """Load clubs data from CSV file"""
+        """Load clubs data from CSV file (cached until the file changes)"""
         try:
-            df = pd.read_csv(
-                CLUBS_CSV_PATH,
-                encoding='utf-8',
-                quotechar='"',
-                escapechar='\\',
-                on_bad_lines='skip',
-                engine='python',
-                skipinitialspace=True,
-                doublequote=True,
-                sep=','
-            )
+            clubs_mtime = os.stat(CLUBS_CSV_PATH).st_mtime
+        except OSError:
+            clubs_mtime = None
+        if self._clubs_df is not None and clubs_mtime is not None and clubs_mtime == self._clubs_mtime:
+            return self._clubs_df
+        
+        try:
+            df = read_clubs_csv(CLUBS_CSV_PATH)
             
             print(f"✅ Loaded {len(df)} records from CSV")
             
             if 'Club' in df.columns:
-                unique_clubs = df.groupby('Club').first().reset_index()
+                unique_clubs = first_row_per_club(df)
                 print(f"✅ Found {len(unique_clubs)} unique clubs")
+                self._clubs_df = unique_clubs
+                self._clubs_mtime = clubs_mtime
+                self._clubs_by_name = dict(zip(unique_clubs['Club'], unique_clubs.to_dict('records')))
                 return unique_clubs
             else:
                 print(f"❌ 'Club' column not found in CSV. Available columns: {list(df.columns)}")
@@ -123,22 +410,26 @@ class EmailPersonalizer:
             print(f"❌ Error loading clubs data: {e}")
             return pd.DataFrame()
     
+    def invalidate_clubs_cache(self):
+        """Force the next load_clubs_data to re-read the clubs CSV (e.g. after an in-place edit within the same mtime tick)"""
+        self._clubs_df = None
+    
     def load_email_template(self, email_type: str = 'introduction') -> str:
-        """Load the base email template for specific email type"""
-        # Get the project root directory (parent of src)
-        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        
-        template_files = {
-            'introduction': 'introduction_email_template.txt',
-            'checkup': 'checkup_email_template.txt',
-            'acceptance': 'acceptance_email_template.txt'
-        }
+        """Load the base email template for specific email type (cached until the file changes)"""
+        cached = self._template_cache.get(email_type)
+        if cached:
+            template_path, template_mtime, content = cached
+            try:
+                if os.stat(template_path).st_mtime == template_mtime:
+                    return content
+            except OSError:
+                pass
         
-        template_filename = template_files.get(email_type, 'introduction_email_template.txt')
+        template_filename = TEMPLATE_FILES.get(email_type, TEMPLATE_FILES['introduction'])
         
         # Try multiple possible locations for templates
         possible_paths = [
-            os.path.join(project_root, 'templates', template_filename),  # Project root/templates/
+            os.path.join(_PROJECT_ROOT, 'templates', template_filename), # Project root/templates/
             os.path.join('templates', template_filename),               # Current dir/templates/
             os.path.join('..', 'templates', template_filename),        # Parent dir/templates/
             os.path.join('..', '..', 'templates', template_filename),  # Two levels up/templates/
@@ -151,6 +442,7 @@ class EmailPersonalizer:
                     with open(template_path, 'r', encoding='utf-8') as file:
                         content = file.read()
                         print(f"✅ Loaded {email_type} template from: {template_path}")
+                        self._template_cache[email_type] = (template_path, os.stat(template_path).st_mtime, content)
                         return content
             except Exception as e:
                 continue
@@ -160,299 +452,593 @@ class EmailPersonalizer:
             with open(EMAIL_TEMPLATE_PATH, 'r', encoding='utf-8') as file:
                 content = file.read()
                 print(f"✅ Loaded fallback template")
+                self._template_cache[email_type] = (EMAIL_TEMPLATE_PATH, os.stat(EMAIL_TEMPLATE_PATH).st_mtime, content)
                 return content
         except Exception as e:
             print(f"❌ Could not load email template for {email_type}")
             return ""
     
-    def get_club_research(self, club_name: str, email_type: str = 'introduction') -> Optional[str]:
-        """Get research data for a club from CSV for specific email type"""
+    def _lookup_research(self, club_name: str, email_type: str = 'introduction') -> _ResearchLookup:
+        """Single research store lookup shared by the public research accessors"""
         try:
-            research_df = pd.read_csv(self.research_csv_path)
-            club_research = research_df[research_df['club_name'] == club_name]
-            
-            if not club_research.empty:
-                research_entry = club_research.iloc[0]
-                
-                # Check if research is still valid
-                expires_at = pd.to_datetime(research_entry['expires_at'])
-                if datetime.now() > expires_at:
-                    print(f"⏰ Research expired for {club_name}")
-                    return None
-                
-                # Return research for specific email type
-                research_columns = {
-                    'introduction': 'introduction_research',
-                    'checkup': 'checkup_research',
-                    'acceptance': 'acceptance_research'
-                }
-                
-                research_column = research_columns.get(email_type, 'introduction_research')
-                research_data = research_entry.get(research_column, '')
-                
-                if research_data:
-                    print(f"📋 Found {email_type} research for {club_name}")
-                    return research_data
-                else:
-                    print(f"❌ No {email_type} research found for {club_name}")
-                    return None
-            
-            print(f"❌ No research found for {club_name}")
-            return None
-            
+            research_entry = self.research_manager.get_research_rows().get(club_name)
         except FileNotFoundError:
             print(f"📁 Research file not found: {self.research_csv_path}")
-            return None
+            return _ResearchLookup(False, None, False)
         except Exception as e:
             print(f"⚠️ Error loading research for {club_name}: {e}")
-            return None
+            return _ResearchLookup(False, None, False)
+        
+        if research_entry is None:
+            return _ResearchLookup(False, None, False)
+        
+        # Check if research is still valid
+        expires_at = research_entry['expires_at']
+        if pd.isna(expires_at) or datetime.now() > expires_at:
+            return _ResearchLookup(True, None, True)
+        
+        # Research for specific email type
+        research_column = RESEARCH_COLUMNS.get(email_type, RESEARCH_COLUMNS['introduction'])
+        research_data = research_entry.get(research_column, '')
+        return _ResearchLookup(True, research_data if isinstance(research_data, str) and research_data else None, False)
+    
+    def get_club_research(self, club_name: str, email_type: str = 'introduction') -> Optional[str]:
+        """Get research data for a club from CSV for specific email type"""
+        lookup = self._lookup_research(club_name, email_type)
+        
+        if lookup.data:
+            print(f"📋 Found {email_type} research for {club_name}")
+        elif lookup.expired:
+            print(f"⏰ Research expired for {club_name}")
+        elif lookup.found:
+            print(f"❌ No {email_type} research found for {club_name}")
+        else:
+            print(f"❌ No research found for {club_name}")
+        return lookup.data
     
     def is_club_research_available(self, club_name: str) -> bool:
         """Check if research is available for a club"""
-        research = self.get_club_research(club_name)
-        return research is not None
+        return self._lookup_research(club_name).data is not None
     
     def preview_club_research(self, club_name: str, email_type: str = 'introduction') -> Optional[str]:
         """Get research preview for a club"""
         return self.get_club_research(club_name, email_type)
     
-    def check_email_sent(self, club_name: str, email_type: str = 'introduction') -> Tuple[bool, Optional[Dict]]:
-        """Check if email has already been sent to a club for specific email type"""
+    def _load_sent_index(self) -> Dict[Tuple[str, str], Dict]:
+        """Scan the tracking CSV once into {(club_name, email_type): record}"""
+        sent_index = {}
         try:
-            tracking_df = pd.read_csv(self.tracking_csv_path)
-            club_record = tracking_df[
-                (tracking_df['club_name'] == club_name) & 
-                (tracking_df['email_type'] == email_type)
-            ]
-            
-            if not club_record.empty:
-                record = club_record.iloc[0]
-                return True, {
-                    'email_sent_date': record.get('email_sent_date', None),
-                    'personalized_content': record.get('personalized_content', ''),
-                    'generated_email': record.get('generated_email', ''),
-                    'total_cost': record.get('total_cost', 0.0),
-                    'created_at': record.get('created_at', None)
-                }
-            return False, None
+            # Saves are appended, so later rows replace earlier ones
+            with open(self.tracking_csv_path, 'r', newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    sent_index[(row['club_name'], row['email_type'])] = self._tracking_record(row)
         except FileNotFoundError:
-            return False, None
+            pass
         except Exception as e:
-            print(f"Error checking email status for {club_name}: {e}")
-            return False, None
+            print(f"Error loading email tracking index: {e}")
+        return sent_index
+    
+    def _tracking_file_stamp(self) -> Optional[Tuple[int, int]]:
+        """(mtime, size) of the tracking CSV; appends always change the size, even within one mtime tick"""
+        try:
+            stat = os.stat(self.tracking_csv_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+    
+    def _get_sent_index(self) -> Dict[Tuple[str, str], Dict]:
+        """The sent-email index, re-read when another instance or process changed the tracking CSV"""
+        tracking_stamp = self._tracking_file_stamp()
+        if tracking_stamp is None or tracking_stamp != self._tracking_stamp:
+            self._flush_tracking_file()  # rows buffered by bulk_run() must be on disk before re-reading
+            self._tracking_stamp = self._tracking_file_stamp()
+            self._sent_index = self._load_sent_index()
+            self._email_totals = self._sum_email_totals()
+        return self._sent_index
+    
+    @contextmanager
+    def _own_tracking_write(self):
+        """Wrap a write to the tracking CSV; the index adopts the result only if it was current beforehand"""
+        was_current = self._tracking_stamp is not None and self._tracking_file_stamp() == self._tracking_stamp
+        yield
+        if was_current:
+            self._tracking_stamp = self._tracking_file_stamp()
+    
+    def _sum_email_totals(self) -> Dict:
+        """Statistics over the indexed records; kept up to date by _set_index_record afterwards"""
+        totals = {'total_emails': 0, 'sent_emails': 0, 'emails_by_type': {}, 'total_content_cost': 0, 'total_cost': 0}
+        for (_, email_type), record in self._sent_index.items():
+            self._add_to_totals(totals, email_type, record, 1)
+        return totals
+    
+    @staticmethod
+    def _add_to_totals(totals: Dict, email_type: str, record: Dict, sign: int):
+        """Add (sign=1) or remove (sign=-1) one record's contribution to the running totals (costs in COST_SCALE units)"""
+        totals['total_emails'] += sign
+        totals['sent_emails'] += sign if record['email_sent_date'] else 0
+        by_type = totals['emails_by_type']
+        by_type[email_type] = by_type.get(email_type, 0) + sign
+        if not by_type[email_type]:
+            del by_type[email_type]
+        # Integer units, so adding and removing records never drifts
+        totals['total_content_cost'] += sign * round(record['content_cost'] * COST_SCALE)
+        totals['total_cost'] += sign * round(record['total_cost'] * COST_SCALE)
+    
+    def _set_index_record(self, key: Tuple[str, str], record: Optional[Dict]):
+        """Replace (or, with None, remove) the indexed record for (club_name, email_type)"""
+        previous = self._sent_index.pop(key, None)
+        if previous is not None:
+            self._add_to_totals(self._email_totals, key[1], previous, -1)
+        if record is not None:
+            self._sent_index[key] = record
+            self._add_to_totals(self._email_totals, key[1], record, 1)
+    
+    @staticmethod
+    def _tracking_record(row: Dict) -> Dict:
+        """Convert a tracking row into the record returned by check_email_sent"""
+        return {
+            'email_sent_date': row.get('email_sent_date') or None,
+            'personalized_content': row.get('personalized_content') or '',
+            'generated_email': row.get('generated_email') or '',
+            'content_cost': round(float(row.get('content_cost') or 0.0), COST_DECIMALS),
+            'total_cost': round(float(row.get('total_cost') or 0.0), COST_DECIMALS),
+            'created_at': row.get('created_at') or None
+        }
+    
+    def check_email_sent(self, club_name: str, email_type: str = 'introduction') -> Tuple[bool, Optional[Dict]]:
+        """Check if email has already been sent to a club for specific email type"""
+        record = self._get_sent_index().get((club_name, email_type))
+        return (True, dict(record)) if record else (False, None)
     
-    def generate_personalized_content(self, club_name: str, club_research: str, email_type: str = 'introduction') -> Tuple[str, Dict]:
+    def generate_personalized_content(self, club_name: str, club_research: str, email_type: str = 'introduction',
+                                      cost_tracker: Optional[CostTracker] = None) -> Tuple[str, Dict]:
         """Generate personalized content using research data for specific email type"""
         
-        cost_tracker = CostTracker()
+        cost_tracker = cost_tracker or CostTracker()
         
-        # Email type specific prompts
-        email_contexts = {
-            'introduction': {
-                'context': 'This is the FIRST email we\'re sending to this club. We are introducing ourselves and offering a discount for DxO products to their members.',
-                'focus': 'catching their attention with recent achievements and specialties',
-                'tone': 'professional and confident - this is our first impression'
-            },
-            'checkup': {
-                'context': 'This is a FOLLOW-UP email because they didn\'t respond to our introduction. We need to create urgency and show value.',
-                'focus': 'upcoming events, deadlines, and time-sensitive opportunities',
-                'tone': 'friendly but urgent - showing we understand their needs'
-            },
-            'acceptance': {
-                'context': 'This email is sent when they ACCEPT our offer. We need to explain how the discount process works.',
-                'focus': 'club structure, member communication, and discount implementation',
-                'tone': 'helpful and instructional - guiding them through the process'
-            }
-        }
+        # Clubs with near-identical research reuse earlier content
+        embedding = None
+        if SEMANTIC_CONTENT_CACHE_ENABLED:
+            embedding = self._embed_research(club_research, cost_tracker)
+            semantic_hit = self._semantic_content_hit(embedding, club_name, email_type, cost_tracker)
+            if semantic_hit:
+                return semantic_hit
         
-        email_context = email_contexts.get(email_type, email_contexts['introduction'])
+        request = self._build_content_request(club_name, club_research, email_type)
+        try:
+            response = cached_chat_completion(self.openai_client, self.completion_cache, **request)
+            personalized_content, costs = self._handle_content_response(response, club_name, email_type, cost_tracker)
+            self._semantic_content_store(embedding, club_name, email_type, personalized_content)
+            return personalized_content, costs
+            
+        except Exception as e:
+            if self.completion_cache is not None:
+                self.completion_cache.discard(request)  # an unusable reply must not be replayed
+            return self._fallback_content(e, club_name, cost_tracker)
+    
+    async def generate_personalized_content_async(self, club_name: str, club_research: str, email_type: str = 'introduction',
+                                                  cost_tracker: Optional[CostTracker] = None) -> Tuple[str, Dict]:
+        """Async variant of generate_personalized_content for concurrent batch generation"""
         
-        # Different prompts for different email types
-        if email_type == 'introduction':
-            content_prompt = f"""
-            You are writing a personalized addition for a professional marketing email from DxO Labs to a photography club.
-
-            **EMAIL TYPE: INTRODUCTION EMAIL**
-            **CONTEXT:** {email_context['context']}
-
-            **CLUB RESEARCH FOR INTRODUCTION EMAIL:**
-            {club_research}
-
-            **YOUR TASK:**
-            Generate ONLY 1-2 personalized sentences that will be inserted after this line in the email:
-            "I'm Killian, part of the Partnerships team at DxO Labs, the creators of award-winning photo editing software like DxO PhotoLab and Nik Collection."
-
-            **REQUIREMENTS:**
-            - Start with "I read about..." or "I came across..." or "I noticed..." or "I was impressed by..."
-            - Reference specific research findings about {club_name}
-            - Focus on {email_context['focus']}
-            - Connect to DxO's software benefits naturally for their specific photography focus
-            - Be {email_context['tone']}
-            - Maximum 2 sentences
-            - Return ONLY the personalized sentences, nothing else
-
-            **EXAMPLE OUTPUT:**
-            "I read about your recent 'Urban Nights' exhibition and was impressed by the technical challenges your members tackled with low-light street photography. I believe DxO PhotoLab's industry-leading noise reduction could help your photographers push those ISO limits even further."
-
-            **GENERATE ONLY THE PERSONALIZED SENTENCES FOR INTRODUCTION EMAIL:**
-            """
+        cost_tracker = cost_tracker or CostTracker()
         
-        elif email_type == 'checkup':
-            content_prompt = f"""
-            You are writing a personalized addition for a follow-up email from DxO Labs to a photography club that didn't respond to the initial offer.
-
-            **EMAIL TYPE: CHECKUP/FOLLOW-UP EMAIL**
-            **CONTEXT:** {email_context['context']}
-
-            **CLUB RESEARCH FOR CHECKUP EMAIL:**
-            {club_research}
-
-            **YOUR TASK:**
-            Generate ONLY 1-2 personalized sentences that will be inserted after the greeting in a follow-up email.
-
-            **REQUIREMENTS:**
-            - Reference upcoming events, deadlines, or time-sensitive opportunities from research
-            - Create urgency but remain friendly
-            - Show you understand their current activities and needs
-            - Connect timing to when DxO tools would be most valuable
-            - Be {email_context['tone']}
-            - Maximum 2 sentences
-            - Return ONLY the personalized sentences, nothing else
-
-            **EXAMPLE OUTPUT:**
-            "I noticed you have your annual photography competition coming up in March and thought this might be perfect timing. Many clubs find DxO tools especially valuable when members are preparing their best work for competitions."
-
-            **GENERATE ONLY THE PERSONALIZED SENTENCES FOR CHECKUP EMAIL:**
-            """
+        embedding = None
+        if SEMANTIC_CONTENT_CACHE_ENABLED:
+            embedding = await self._embed_research_async(club_research, cost_tracker)
+            semantic_hit = self._semantic_content_hit(embedding, club_name, email_type, cost_tracker)
+            if semantic_hit:
+                return semantic_hit
         
-        elif email_type == 'acceptance':
-            content_prompt = f"""
-            You are writing a personalized addition for an acceptance email from DxO Labs to a photography club that has shown interest in the partnership.
-
-            **EMAIL TYPE: ACCEPTANCE/PARTNERSHIP EMAIL**
-            **CONTEXT:** {email_context['context']}
-
-            **CLUB RESEARCH FOR ACCEPTANCE EMAIL:**
-            {club_research}
-
-            **YOUR TASK:**
-            Generate ONLY 1-2 personalized sentences that acknowledge their club structure and show understanding of how they communicate with members.
-
-            **REQUIREMENTS:**
-            - Reference their club size, organization, or communication methods from research
-            - Show understanding of how they handle member benefits
-            - Acknowledge their community or leadership structure
-            - Be {email_context['tone']}
-            - Maximum 2 sentences
-            - Return ONLY the personalized sentences, nothing else
-
-            **EXAMPLE OUTPUT:**
-            "I understand you have about 50 active members and typically share benefits through your monthly newsletter. This partnership structure should work perfectly with your existing member communication process."
-
-            **GENERATE ONLY THE PERSONALIZED SENTENCES FOR ACCEPTANCE EMAIL:**
-            """
+        request = self._build_content_request(club_name, club_research, email_type)
+        try:
+            response = await cached_chat_completion_async(self.async_client, self.completion_cache, **request)
+            personalized_content, costs = self._handle_content_response(response, club_name, email_type, cost_tracker)
+            self._semantic_content_store(embedding, club_name, email_type, personalized_content)
+            return personalized_content, costs
+            
+        except Exception as e:
+            if self.completion_cache is not None:
+                self.completion_cache.discard(request)  # an unusable reply must not be replayed
+            return self._fallback_content(e, club_name, cost_tracker)
+    
+    def _content_semantic_cache(self, email_type: str) -> SemanticCache:
+        """One semantic cache namespace per email type, opened on first use"""
+        if email_type not in self._content_semantic_caches:
+            self._content_semantic_caches[email_type] = SemanticCache(
+                SEMANTIC_CACHE_PATH, f'content-{email_type}', SEMANTIC_CACHE_THRESHOLD
+            )
+        return self._content_semantic_caches[email_type]
+    
+    def _embed_research(self, club_research: str, cost_tracker: CostTracker) -> Optional[List[float]]:
+        """Embed club research for the semantic content cache (None if the call fails)"""
+        try:
+            response = self.openai_client.embeddings.create(model=EMBEDDING_MODEL, input=club_research)
+            cost_tracker.add_embedding_cost(getattr(response.usage, 'prompt_tokens', 0))
+            return response.data[0].embedding
+        except Exception as e:
+            print(f"⚠️ Semantic cache embedding failed: {e}")
+            return None
+    
+    async def _embed_research_async(self, club_research: str, cost_tracker: CostTracker) -> Optional[List[float]]:
+        """Async variant of _embed_research"""
+        try:
+            response = await self.async_client.embeddings.create(model=EMBEDDING_MODEL, input=club_research)
+            cost_tracker.add_embedding_cost(getattr(response.usage, 'prompt_tokens', 0))
+            return response.data[0].embedding
+        except Exception as e:
+            print(f"⚠️ Semantic cache embedding failed: {e}")
+            return None
+    
+    def _semantic_content_hit(self, embedding, club_name: str, email_type: str,
+                              cost_tracker: CostTracker) -> Optional[Tuple[str, Dict]]:
+        """Reuse content generated for a club with similar research, charging only the embedding"""
+        if embedding is None:
+            return None
         
-        else:
-            # Default to introduction
-            content_prompt = f"""
-            You are writing a personalized addition for a professional marketing email from DxO Labs to a photography club.
-
-            **CLUB RESEARCH:**
-            {club_research}
-
-            **YOUR TASK:**
-            Generate ONLY 1-2 personalized sentences referencing specific research findings about {club_name}.
-
-            **REQUIREMENTS:**
-            - Reference specific research findings
-            - Connect to DxO's software benefits
-            - Maximum 2 sentences
-            - Return ONLY the personalized sentences, nothing else
-
-            **GENERATE PERSONALIZED CONTENT:**
-            """
+        match = self._content_semantic_cache(email_type).lookup(embedding)
+        if not match:
+            return None
         
+        cached, similarity = match
+        # Entries whose text still names the source club (a variant the templating missed) would leak it
+        source_club = cached.get('club_name') or ''
+        if source_club.lower() != club_name.lower() and source_club.lower() in cached['content'].lower():
+            return None
+        print(f"🎯 Semantic cache hit for {club_name} {email_type} content (similarity {similarity:.3f}, from {source_club})")
+        personalized_content = cached['content'].replace(CLUB_NAME_PLACEHOLDER, club_name)
+        return personalized_content, cost_tracker.get_costs()
+    
+    def _semantic_content_store(self, embedding, club_name: str, email_type: str, personalized_content: str):
+        """Remember generated content, with the club name templated out, for clubs with similar research"""
+        if embedding is None:
+            return
         try:
-            response = self.openai_client.chat.completions.create(
-                model=CONTENT_MODEL,
-                messages=[
-                    {"role": "system", "content": f"You are a professional marketing specialist for DxO Labs creating personalized content for photography club {email_type} emails. Generate ONLY the requested personalized sentences that show genuine knowledge of the club and connect to DxO software benefits. Do not include any email template or other content."},
-                    {"role": "user", "content": content_prompt}
-                ],
-                temperature=0.8,
-                max_tokens=200
-            )
-            
-            # Track costs
-            if hasattr(response, 'usage') and response.usage:
-                usage = response.usage
-                input_tokens = getattr(usage, 'prompt_tokens', 0)
-                output_tokens = getattr(usage, 'completion_tokens', 0)
-                cached_tokens = getattr(usage, 'prompt_tokens_cached', 0)
-                
-                cost_tracker.add_content_cost(input_tokens, output_tokens, cached_tokens)
-            
-            personalized_content = response.choices[0].message.content.strip()
-            print(f"✨ Generated {email_type} personalized content for {club_name}: {len(personalized_content)} characters")
-            
-            return personalized_content, cost_tracker.get_costs()
-            
+            self._content_semantic_cache(email_type).store(club_name, embedding, {
+                'club_name': club_name,
+                'content': re.sub(re.escape(club_name), CLUB_NAME_PLACEHOLDER, personalized_content, flags=re.IGNORECASE)
+            })
         except Exception as e:
-            print(f"❌ Error generating personalized content for {club_name}: {e}")
-            fallback_content = f"I came across {club_name} and was impressed by your photography community's dedication to advancing the art of photography. I'd love to explore how DxO's professional editing tools could support your members' creative work."
-            return fallback_content, cost_tracker.get_costs()
+            print(f"⚠️ Error storing semantic cache entry: {e}")
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _build_content_prompt(club_name: str, club_research: str) -> str:
+        """Render the club data message once per (club, research); retries and batches reuse the same string"""
+        return f"CLUB: {club_name}\n\nCLUB RESEARCH:\n{club_research}"
+    
+    def _build_content_messages(self, club_name: str, club_research: str, email_type: str = 'introduction') -> List[Dict]:
+        """Build the chat messages for the content generation request (static system prefix, club data last)"""
+        system_prompt = CONTENT_SYSTEM_PROMPTS.get(email_type, CONTENT_SYSTEM_PROMPTS['default'])
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": self._build_content_prompt(club_name, club_research)}
+        ]
+    
+    def _build_content_request(self, club_name: str, club_research: str, email_type: str = 'introduction') -> Dict:
+        """Chat completion arguments for one club's content (shared by the direct, async and batch paths)"""
+        return {
+            "model": CONTENT_MODEL,
+            "messages": self._build_content_messages(club_name, club_research, email_type),
+            "response_format": CONTENT_RESPONSE_FORMAT,
+            "prompt_cache_key": f"club-content-{email_type}",
+            "temperature": CONTENT_TEMPERATURE,
+            "max_tokens": CONTENT_MAX_TOKENS
+        }
+    
+    def _handle_content_response(self, response, club_name: str, email_type: str, cost_tracker: CostTracker) -> Tuple[str, Dict]:
+        """Track costs and extract the personalized content from a completion"""
+        # Track costs
+        if hasattr(response, 'usage') and response.usage:
+            usage = response.usage
+            input_tokens = getattr(usage, 'prompt_tokens', 0)
+            output_tokens = getattr(usage, 'completion_tokens', 0)
+            cached_tokens = get_cached_tokens(usage)
+            log_prompt_cache_ratio(CONTENT_MODEL, input_tokens, cached_tokens)
+            
+            cost_tracker.add_content_cost(input_tokens, output_tokens, cached_tokens)
+        
+        choice = response.choices[0]
+        if getattr(choice, 'finish_reason', None) == 'length':
+            raise ValueError(f"Content reply was cut off at {CONTENT_MAX_TOKENS} tokens")
+        personalized_content = self._parse_content_sentences(choice.message.content)
+        logger.debug("Generated %s personalized content for %s: %d characters", email_type, club_name, len(personalized_content))
+        
+        return personalized_content, cost_tracker.get_costs()
+    
+    @staticmethod
+    def _parse_content_sentences(content: str) -> str:
+        """The 'sentences' field of a CONTENT_RESPONSE_FORMAT reply (ValueError if the reply isn't one)"""
+        try:
+            parsed = json.loads(content)
+        except (TypeError, ValueError):
+            raise ValueError(f"Content reply is not valid JSON: {str(content)[:100]}")
+        if not isinstance(parsed, dict) or not isinstance(parsed.get('sentences'), str):
+            raise ValueError(f"Unexpected structured content: {content[:100]}")
+        return parsed['sentences'].strip()
+    
+    def _fallback_content(self, error: Exception, club_name: str, cost_tracker: CostTracker) -> Tuple[str, Dict]:
+        """Generic personalization used when the content request fails"""
+        print(f"❌ Error generating personalized content for {club_name}: {error}")
+        fallback_content = f"I came across {club_name} and was impressed by your photography community's dedication to advancing the art of photography. I'd love to explore how DxO's professional editing tools could support your members' creative work."
+        return fallback_content, cost_tracker.get_costs()
     
     def generate_personalized_email(self, club_name: str, email_type: str = 'introduction', auto_research: bool = True) -> Tuple[str, str, str, Dict]:
         """Generate complete personalized email for a club with automatic research if needed"""
         
         # Check if research is available
         club_research = self.get_club_research(club_name, email_type)
-        total_costs = {'total_cost': 0.0, 'content_cost': 0.0, 'search_cost': 0.0}
+        cost_tracker = CostTracker()  # research and content costs for this email
         
         if not club_research and auto_research:
-            print(f"🔍 No {email_type} research found for '{club_name}'. Auto-researching...")
-            
-            # Get club data for research
-            clubs_df = self.load_clubs_data()
-            club_data = clubs_df[clubs_df['Club'] == club_name]
-            
-            if club_data.empty:
-                raise ValueError(f"Club '{club_name}' not found in clubs database")
-            
-            club_row = club_data.iloc[0]
-            website = club_row.get('Website', '')
-            country = club_row.get('Country', '')
+            website, country = self._get_research_target(club_name, email_type)
             
             # Perform automatic research
             print(f"🔍 Researching {club_name} automatically...")
             research_results, research_costs = self.research_manager.research_club_with_o3(
                 club_name, website, country
             )
+            club_research = self._after_auto_research(club_name, email_type, research_results, research_costs, cost_tracker)
+        
+        elif not club_research:
+            raise ValueError(f"No {email_type} research available for '{club_name}' and auto-research is disabled.")
+        
+        print(f"✨ Generating {email_type} email for {club_name} using available research...")
+        
+        # Generate personalized content
+        personalized_content, costs = self.generate_personalized_content(club_name, club_research, email_type, cost_tracker)
+        
+        return self._finish_personalized_email(club_name, email_type, club_research, personalized_content, costs)
+    
+    async def generate_personalized_email_async(self, club_name: str, email_type: str = 'introduction', auto_research: bool = True,
+                                                research_slots: Optional[asyncio.Semaphore] = None,
+                                                content_slots: Optional[asyncio.Semaphore] = None) -> Tuple[str, str, str, Dict]:
+        """
+        Async variant of generate_personalized_email; research and content calls are awaited.
+        
+        The optional semaphores limit the research and content stages separately (see generate_many).
+        """
+        
+        club_research = self.get_club_research(club_name, email_type)
+        cost_tracker = CostTracker()
+        
+        if not club_research and auto_research:
+            website, country = self._get_research_target(club_name, email_type)
+            
+            print(f"🔍 Researching {club_name} automatically...")
+            async with research_slots or nullcontext():
+                research_results, research_costs = await self.research_manager.research_club_with_o3_async(
+                    club_name, website, country
+                )
+            club_research = self._after_auto_research(club_name, email_type, research_results, research_costs, cost_tracker)
+        
+        elif not club_research:
+            raise ValueError(f"No {email_type} research available for '{club_name}' and auto-research is disabled.")
+        
+        print(f"✨ Generating {email_type} email for {club_name} using available research...")
+        
+        async with content_slots or nullcontext():
+            personalized_content, costs = await self.generate_personalized_content_async(club_name, club_research, email_type, cost_tracker)
+        
+        return self._finish_personalized_email(club_name, email_type, club_research, personalized_content, costs)
+    
+    async def generate_many(self, club_names: List[str], email_type: str = 'introduction',
+                            auto_research: bool = True, concurrency: int = GENERATION_CONCURRENCY,
+                            research_concurrency: int = RESEARCH_CONCURRENCY) -> List:
+        """
+        Generate emails for several clubs concurrently.
+        
+        The two stages are limited separately to stay inside the API rate limits: at most
+        `research_concurrency` auto-research calls and `concurrency` content calls are in
+        flight at once, so clubs that are already researched go straight to content
+        generation while others wait for research. A club listed more than once is only
+        generated once. Returns one entry per club, in order: the generate_personalized_email
+        tuple, or the exception raised for that club.
+        """
+        research_slots = asyncio.Semaphore(research_concurrency)
+        content_slots = asyncio.Semaphore(concurrency)
+        unique_clubs = list(dict.fromkeys(club_names))
+        
+        async def generate_one(club_name: str):
+            return await self.generate_personalized_email_async(
+                club_name, email_type, auto_research, research_slots, content_slots
+            )
+        
+        results = await asyncio.gather(*[generate_one(club_name) for club_name in unique_clubs], return_exceptions=True)
+        by_club = dict(zip(unique_clubs, results))
+        return [by_club[club_name] for club_name in club_names]
+
+    def generate_personalized_emails(self, club_names: List[str], email_type: str = 'introduction',
+                                     auto_research: bool = True, concurrency: int = GENERATION_CONCURRENCY,
+                                     research_concurrency: int = RESEARCH_CONCURRENCY) -> List:
+        """Blocking wrapper around generate_many for scripts and other synchronous callers"""
+        return asyncio.run(self.generate_many(club_names, email_type, auto_research, concurrency, research_concurrency))
+
+    def submit_content_batch(self, club_names: List[str], email_type: str = 'introduction') -> str:
+        """
+        Submit content generation for many researched clubs through the Batch API.
+        
+        Clubs without stored research are skipped (run research first, e.g. with
+        ClubResearchManager.submit_research_batch). Returns the batch id.
+        """
+        requests = []
+        for club_name in dict.fromkeys(club_names):  # club names are the batch custom_ids, which must be unique
+            club_research = self.get_club_research(club_name, email_type)
+            if not club_research:
+                print(f"⏭️ Skipping {club_name}: no {email_type} research available")
+                continue
+            requests.append((club_name, self._build_content_request(club_name, club_research, email_type)))
+        return submit_chat_batch(self.openai_client, requests)
+    
+    def collect_content_batch(self, batch_id: str, club_names: List[str], email_type: str = 'introduction',
+                              wait: bool = True, poll_interval: float = 60.0) -> Optional[Dict]:
+        """
+        Build the emails from a finished submit_content_batch run.
+        
+        Returns {club_name: generate_personalized_email tuple or exception}, or None if
+        `wait` is False and the batch has not finished yet.
+        """
+        if wait:
+            results = wait_for_chat_batch(self.openai_client, batch_id, poll_interval)
+        else:
+            results = fetch_chat_batch(self.openai_client, batch_id)
+            if results is None:
+                return None
+        log_batch_token_cost(CONTENT_MODEL, results)
+        
+        emails = {}
+        for club_name in club_names:
+            response = results.get(club_name)
+            if response is None:
+                emails[club_name] = ValueError(f"No {email_type} batch result for '{club_name}'")
+                continue
             
-            # Add research costs to total
-            total_costs['search_cost'] += research_costs.get('total_cost', 0.0)
-            total_costs['total_cost'] += research_costs.get('total_cost', 0.0)
+            cost_tracker = CostTracker(batch_discount=BATCH_DISCOUNT)
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                personalized_content, content_costs = self._handle_content_response(response, club_name, email_type, cost_tracker)
+            except Exception as e:
+                personalized_content, content_costs = self._fallback_content(e, club_name, cost_tracker)
+            
+            try:
+                club_research = self.get_club_research(club_name, email_type)
+                emails[club_name] = self._finish_personalized_email(
+                    club_name, email_type, club_research, personalized_content, content_costs
+                )
+            except Exception as e:
+                emails[club_name] = e
+        
+        return emails
+    
+    def generate_personalized_content_packed(self, clubs: List[Tuple[str, str]], email_type: str = 'introduction') -> Dict[str, object]:
+        """
+        Generate personalized content for several (club_name, club_research) pairs in one request.
+        
+        Returns {club_name: (personalized_content, costs) or exception}; clubs missing from the
+        reply get a ValueError. The request is billed once and its cost is split evenly across the clubs.
+        """
+        cost_tracker = CostTracker()
+        system_prompt = PACKED_CONTENT_SYSTEM_PROMPTS.get(email_type, PACKED_CONTENT_SYSTEM_PROMPTS['default'])
+        user_prompt = "\n---\n".join(
+            self._build_content_prompt(club_name, club_research) for club_name, club_research in clubs
+        )
+        
+        request = {
+            "model": CONTENT_MODEL,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "response_format": {"type": "json_object"},
+            "prompt_cache_key": f"club-content-packed-{email_type}",
+            "temperature": CONTENT_TEMPERATURE,
+            "max_tokens": 250 * len(clubs)
+        }
+        
+        try:
+            response = cached_chat_completion(self.openai_client, self.completion_cache, **request)
             
-            print(f"✅ Auto-research completed for {club_name}. Cost: ${research_costs.get('total_cost', 0.0):.4f}")
+            if hasattr(response, 'usage') and response.usage:
+                usage = response.usage
+                input_tokens = getattr(usage, 'prompt_tokens', 0)
+                cached_tokens = get_cached_tokens(usage)
+                log_prompt_cache_ratio(CONTENT_MODEL, input_tokens, cached_tokens)
+                cost_tracker.add_content_cost(input_tokens, getattr(usage, 'completion_tokens', 0), cached_tokens)
             
-            # Now get the research we just generated
+            packed = json.loads(response.choices[0].message.content)
+            generated = {
+                str(item.get('club', '')).strip(): str(item.get('personalized', '')).strip()
+                for item in packed.get('emails', []) if isinstance(item, dict)
+            }
+        except Exception as e:
+            print(f"❌ Error generating packed {email_type} content for {len(clubs)} clubs: {e}")
+            generated = {}
+        
+        # Each club carries an equal share of the single request's cost
+        share = {key: value / len(clubs) for key, value in cost_tracker.get_costs().items()}
+        
+        contents = {}
+        for club_name, _ in clubs:
+            personalized_content = generated.get(club_name)
+            if personalized_content:
+                logger.debug("Generated %s personalized content for %s: %d characters", email_type, club_name, len(personalized_content))
+                contents[club_name] = (personalized_content, dict(share))
+            else:
+                contents[club_name] = ValueError(f"No packed {email_type} result for '{club_name}'")
+        
+        # Don't replay a reply that failed to parse or left clubs out
+        if self.completion_cache is not None and any(isinstance(result, Exception) for result in contents.values()):
+            self.completion_cache.discard(request)
+        
+        return contents
+    
+    def generate_packed_emails(self, club_names: List[str], email_type: str = 'introduction',
+                               pack_size: int = CONTENT_PACK_SIZE) -> Dict[str, object]:
+        """
+        Generate emails for researched clubs, packing `pack_size` clubs into each content request.
+        
+        Returns {club_name: generate_personalized_email tuple or exception}; clubs without
+        stored research get a ValueError (research them first).
+        """
+        emails = {}
+        researched = []
+        for club_name in club_names:
             club_research = self.get_club_research(club_name, email_type)
+            if club_research:
+                researched.append((club_name, club_research))
+            else:
+                emails[club_name] = ValueError(f"No {email_type} research available for '{club_name}'")
+        
+        for start in range(0, len(researched), pack_size):
+            pack = researched[start:start + pack_size]
+            print(f"📦 Generating {email_type} content for {len(pack)} clubs in one request...")
+            contents = self.generate_personalized_content_packed(pack, email_type)
             
-            if not club_research:
-                raise ValueError(f"Auto-research failed to generate {email_type} research for '{club_name}'")
+            for club_name, club_research in pack:
+                if isinstance(contents[club_name], Exception):
+                    emails[club_name] = contents[club_name]
+                    continue
+                personalized_content, content_costs = contents[club_name]
+                try:
+                    emails[club_name] = self._finish_personalized_email(
+                        club_name, email_type, club_research, personalized_content, content_costs
+                    )
+                except Exception as e:
+                    emails[club_name] = e
         
-        elif not club_research:
-            raise ValueError(f"No {email_type} research available for '{club_name}' and auto-research is disabled.")
+        return emails
+    
+    def _get_research_target(self, club_name: str, email_type: str) -> Tuple[str, str]:
+        """Look up the website and country used to auto-research a club"""
+        print(f"🔍 No {email_type} research found for '{club_name}'. Auto-researching...")
         
-        print(f"✨ Generating {email_type} email for {club_name} using available research...")
+        # Get club data for research
+        self.load_clubs_data()
+        club_row = self._clubs_by_name.get(club_name)
         
-        # Generate personalized content
-        personalized_content, content_costs = self.generate_personalized_content(club_name, club_research, email_type)
+        if club_row is None:
+            raise ValueError(f"Club '{club_name}' not found in clubs database")
+        
+        return club_row.get('Website', ''), club_row.get('Country', '')
+    
+    def _after_auto_research(self, club_name: str, email_type: str, research_results: Dict, research_costs: Dict,
+                             cost_tracker: CostTracker) -> str:
+        """Add auto-research costs to the email's tracker and return the section for this email type"""
+        cost_tracker.add_research_cost(research_costs)
+        
+        print(f"✅ Auto-research completed for {club_name}. Cost: ${research_costs.get('total_cost', 0.0):.4f}")
+        
+        # Use the sections research_club_with_o3 returned (they were also saved to the CSV) instead of reading them back
+        club_research = research_results.get(RESEARCH_COLUMNS.get(email_type, RESEARCH_COLUMNS['introduction']))
         
-        # Add content costs to total
-        total_costs['content_cost'] += content_costs.get('total_cost', 0.0)
-        total_costs['total_cost'] += content_costs.get('total_cost', 0.0)
+        if not isinstance(club_research, str) or not club_research:
+            raise ValueError(f"Auto-research failed to generate {email_type} research for '{club_name}'")
         
+        return club_research
+    
+    def _finish_personalized_email(self, club_name: str, email_type: str, club_research: str,
+                                   personalized_content: str, costs: Dict) -> Tuple[str, str, str, Dict]:
+        """Merge the personalized content into the template; `costs` are the email's research and content costs"""
         # Load email template
         template = self.load_email_template(email_type)
         if not template:
@@ -464,9 +1050,9 @@ class EmailPersonalizer:
         print(f"✅ {email_type.capitalize()} email generation completed for {club_name}")
         print(f"📝 Personalized content: {personalized_content[:100]}...")
         print(f"📧 Complete email length: {len(complete_email)} characters")
-        print(f"💰 Total cost: ${total_costs['total_cost']:.4f} (Research: ${total_costs['search_cost']:.4f}, Content: ${total_costs['content_cost']:.4f})")
+        print(f"💰 Total cost: ${costs['total_cost']:.4f} (Research: ${costs['search_cost']:.4f}, Content: ${costs['content_cost']:.4f})")
         
-        return complete_email, personalized_content, club_research, total_costs
+        return complete_email, personalized_content, club_research, costs
     
     def combine_email_with_personalization(self, template: str, personalized_content: str, club_name: str, email_type: str = 'introduction') -> str:
         """Combine the email template with personalized content based on email type"""
@@ -474,6 +1060,10 @@ class EmailPersonalizer:
         # Replace club name placeholder
         email = template.replace("{{Company name}}", club_name)
         
+        # Our templates mark the insertion point; the searches below handle templates that don't
+        if PERSONALIZATION_PLACEHOLDER in email:
+            return email.replace(PERSONALIZATION_PLACEHOLDER, personalized_content)
+        
         if email_type == 'introduction':
             return self._insert_introduction_personalization(email, personalized_content)
         elif email_type == 'checkup':
@@ -486,51 +1076,27 @@ class EmailPersonalizer:
     
     def _insert_introduction_personalization(self, email: str, personalized_content: str) -> str:
         """Insert personalization for introduction emails"""
-        # Look for the exact pattern from the template
-        killian_line = "I'm Killian, part of the Partnerships team at DxO Labs, the creators of award-winning photo editing software like DxO PhotoLab and Nik Collection."
-        
-        killian_position = email.find(killian_line)
+        match = _INTRO_INSERT_RE.search(email)
         
-        if killian_position != -1:
-            # Find the end of this line
-            killian_end = killian_position + len(killian_line)
-            
-            # Look for the pattern after Killian's line: should be "\n\nWe're offering"
-            next_section_start = email.find("\n\nWe're offering", killian_end)
-            
-            if next_section_start != -1:
-                # Insert personalized content between Killian's line and "We're offering..."
-                combined_email = (
-                    email[:killian_end] + 
-                    f"\n\n{personalized_content}" + 
-                    email[next_section_start:]
-                )
-                print(f"✅ Successfully inserted introduction personalization after Killian's introduction")
-                return combined_email
+        if match:
+            # Insert personalized content between Killian's line and the next section
+            combined_email = ''.join((
+                email[:match.end('killian')], "\n\n", personalized_content, email[match.end():]
+            ))
+            if match.group('offer') is not None:
+                logger.debug("Inserted introduction personalization after Killian's introduction")
             else:
-                # Fallback: look for any double newline after Killian's line
-                next_paragraph = email.find("\n\n", killian_end)
-                if next_paragraph != -1:
-                    combined_email = (
-                        email[:killian_end] + 
-                        f"\n\n{personalized_content}" + 
-                        email[next_paragraph:]
-                    )
-                    print(f"✅ Inserted introduction personalization at next paragraph break")
-                    return combined_email
+                logger.debug("Inserted introduction personalization at next paragraph break")
+            return combined_email
         
         # Fallback: append at the end before signature
-        signature_start = email.find("Best regards,")
-        if signature_start != -1:
-            combined_email = (
-                email[:signature_start] + 
-                f"{personalized_content}\n\n" + 
-                email[signature_start:]
-            )
-            print(f"✅ Inserted introduction personalization before signature")
+        before, signature, after = email.partition("Best regards,")
+        if signature:
+            combined_email = ''.join((before, personalized_content, "\n\n", signature, after))
+            logger.debug("Inserted introduction personalization before signature")
             return combined_email
         
-        return email + f"\n\n{personalized_content}"
+        return ''.join((email, "\n\n", personalized_content))
     
     def _insert_checkup_personalization(self, email: str, personalized_content: str, club_name: str) -> str:
         """Insert personalization for checkup emails"""
@@ -546,64 +1112,46 @@ class EmailPersonalizer:
                 next_paragraph = email.find("\n\n", line_end)
                 if next_paragraph != -1:
                     # Insert personalized content after greeting
-                    combined_email = (
-                        email[:next_paragraph] + 
-                        f"\n\n{personalized_content}" + 
-                        email[next_paragraph:]
-                    )
-                    print(f"✅ Successfully inserted checkup personalization after greeting")
+                    combined_email = ''.join((
+                        email[:next_paragraph], "\n\n", personalized_content, email[next_paragraph:]
+                    ))
+                    logger.debug("Inserted checkup personalization after greeting")
                     return combined_email
         
         # Fallback: insert before "I just wanted to follow up"
-        followup_start = email.find("I just wanted to follow up")
-        if followup_start != -1:
-            combined_email = (
-                email[:followup_start] + 
-                f"{personalized_content}\n\n" + 
-                email[followup_start:]
-            )
-            print(f"✅ Inserted checkup personalization before follow-up message")
+        before, followup, after = email.partition("I just wanted to follow up")
+        if followup:
+            combined_email = ''.join((before, personalized_content, "\n\n", followup, after))
+            logger.debug("Inserted checkup personalization before follow-up message")
             return combined_email
         
         # Last resort: after first paragraph
         first_paragraph_end = email.find("\n\n")
         if first_paragraph_end != -1:
-            combined_email = (
-                email[:first_paragraph_end] + 
-                f"\n\n{personalized_content}" + 
-                email[first_paragraph_end:]
-            )
-            print(f"✅ Inserted checkup personalization after first paragraph")
+            combined_email = ''.join((
+                email[:first_paragraph_end], "\n\n", personalized_content, email[first_paragraph_end:]
+            ))
+            logger.debug("Inserted checkup personalization after first paragraph")
             return combined_email
         
-        return email + f"\n\n{personalized_content}"
+        return ''.join((email, "\n\n", personalized_content))
     
     def _insert_acceptance_personalization(self, email: str, personalized_content: str, club_name: str) -> str:
         """Insert personalization for acceptance emails"""
         # For acceptance emails, insert after the greeting and thank you line
-        greeting_section = email.find("I hope you're doing well, and thank you again for your previous reply.")
+        before, greeting_sentence, after = email.partition("I hope you're doing well, and thank you again for your previous reply.")
         
-        if greeting_section != -1:
-            # Find the end of this sentence and insert after it
-            sentence_end = email.find(".", greeting_section) + 1
+        if greeting_sentence:
             # Insert personalized content right after the greeting sentence
-            combined_email = (
-                email[:sentence_end] + 
-                f"\n\n{personalized_content}\n\n" + 
-                email[sentence_end:].lstrip()
-            )
-            print(f"✅ Successfully inserted acceptance personalization after greeting")
+            combined_email = ''.join((before, greeting_sentence, "\n\n", personalized_content, "\n\n", after.lstrip()))
+            logger.debug("Inserted acceptance personalization after greeting")
             return combined_email
         
         # Fallback: insert before the discount details
-        discount_start = email.find("We'd love to offer your photography club")
-        if discount_start != -1:
-            combined_email = (
-                email[:discount_start] + 
-                f"{personalized_content}\n\n" + 
-                email[discount_start:]
-            )
-            print(f"✅ Inserted acceptance personalization before discount details")
+        before, discount, after = email.partition("We'd love to offer your photography club")
+        if discount:
+            combined_email = ''.join((before, personalized_content, "\n\n", discount, after))
+            logger.debug("Inserted acceptance personalization before discount details")
             return combined_email
         
         # Another fallback: after the greeting line
@@ -620,108 +1168,207 @@ class EmailPersonalizer:
                 # Find the next paragraph break
                 next_paragraph = email.find("\n\n", line_end)
                 if next_paragraph != -1:
-                    combined_email = (
-                        email[:next_paragraph] + 
-                        f"\n\n{personalized_content}" + 
-                        email[next_paragraph:]
-                    )
-                    print(f"✅ Inserted acceptance personalization after greeting line")
+                    combined_email = ''.join((
+                        email[:next_paragraph], "\n\n", personalized_content, email[next_paragraph:]
+                    ))
+                    logger.debug("Inserted acceptance personalization after greeting line")
                     return combined_email
         
         # Absolute last resort: append at the end before signature
-        signature_start = email.find("Best regards,")
-        if signature_start != -1:
-            combined_email = (
-                email[:signature_start] + 
-                f"{personalized_content}\n\n" + 
-                email[signature_start:]
-            )
-            print(f"✅ Inserted acceptance personalization before signature")
+        before, signature, after = email.partition("Best regards,")
+        if signature:
+            combined_email = ''.join((before, personalized_content, "\n\n", signature, after))
+            logger.debug("Inserted acceptance personalization before signature")
             return combined_email
         
-        return email + f"\n\n{personalized_content}"
+        return ''.join((email, "\n\n", personalized_content))
     
     def save_generated_email(self, club_name: str, personalized_content: str, generated_email: str, costs: Dict, email_type: str = 'introduction', mark_as_sent: bool = False):
         """Save generated email to CSV with cost tracking"""
         
         print(f"💾 Saving {email_type} email for {club_name}...")
         
-        try:
-            tracking_df = pd.read_csv(self.tracking_csv_path)
-        except FileNotFoundError:
-            tracking_df = pd.DataFrame(columns=[
-                'club_name', 'email_type', 'email_sent_date', 'personalized_content', 
-                'generated_email', 'content_cost', 'total_cost', 'created_at'
-            ])
+        record = self._new_tracking_record(club_name, personalized_content, generated_email, costs, email_type,
+                                           datetime.now().isoformat(), mark_as_sent)
+        self._append_tracking_records([record])
         
-        email_sent_date = datetime.now().isoformat() if mark_as_sent else None
-        created_at = datetime.now().isoformat()
+        print(f"✅ {email_type.capitalize()} email saved for {club_name} (Cost: ${costs.get('total_cost', 0):.4f})" + (" and marked as sent" if mark_as_sent else ""))
+    
+    def save_generated_emails(self, emails: List[Tuple[str, str, str, Dict]], email_type: str = 'introduction',
+                              mark_as_sent: bool = False):
+        """
+        Save several generated emails with a single append to the tracking CSV.
+        
+        `emails` are (club_name, personalized_content, generated_email, costs) tuples.
+        """
+        if not emails:
+            return
         
-        # Remove existing record if it exists
-        tracking_df = tracking_df[
-            ~((tracking_df['club_name'] == club_name) & (tracking_df['email_type'] == email_type))
+        now_iso = datetime.now().isoformat()
+        records = [
+            self._new_tracking_record(club_name, personalized_content, generated_email, costs, email_type, now_iso, mark_as_sent)
+            for club_name, personalized_content, generated_email, costs in emails
         ]
+        self._append_tracking_records(records)
         
-        # Add new record
-        new_record = pd.DataFrame([{
+        total_cost = sum(record['total_cost'] for record in records)
+        print(f"💾 Saved {len(records)} {email_type} emails (Cost: ${total_cost:.4f})" + (" and marked them as sent" if mark_as_sent else ""))
+    
+    @staticmethod
+    def _new_tracking_record(club_name: str, personalized_content: str, generated_email: str, costs: Dict,
+                             email_type: str, now_iso: str, mark_as_sent: bool) -> Dict:
+        """Tracking row for a freshly generated email"""
+        return {
             'club_name': club_name,
             'email_type': email_type,
-            'email_sent_date': email_sent_date,
+            'email_sent_date': now_iso if mark_as_sent else None,
             'personalized_content': personalized_content,
             'generated_email': generated_email,
             'content_cost': costs.get('content_cost', 0.0),
             'total_cost': costs.get('total_cost', 0.0),
-            'created_at': created_at
-        }])
+            'created_at': now_iso
+        }
+    
+    @contextmanager
+    def bulk_run(self):
+        """
+        Keep the tracking CSV open for a run of many saves.
         
-        tracking_df = pd.concat([tracking_df, new_record], ignore_index=True)
-        tracking_df.to_csv(self.tracking_csv_path, index=False)
+        Rows are written every TRACKING_FLUSH_EVERY rows and when the block exits, and
+        automatic compaction waits until then. Nested calls share the outer run.
+        """
+        if self._tracking_file is not None:
+            yield self
+            return
         
-        print(f"✅ {email_type.capitalize()} email saved for {club_name} (Cost: ${costs.get('total_cost', 0):.4f})" + (" and marked as sent" if mark_as_sent else ""))
+        self._initialize_tracking_csv()
+        self._tracking_file = open(self.tracking_csv_path, 'a', newline='', encoding='utf-8')
+        try:
+            yield self
+        finally:
+            self._flush_tracking_file()
+            self._tracking_file.close()
+            self._tracking_file = None
+            if self._saves_since_compaction >= TRACKING_COMPACT_EVERY:
+                self.compact_tracking_csv()
+    
+    def _flush_tracking_file(self):
+        """Write out rows buffered by bulk_run() so the CSV can be read or rewritten"""
+        if self._tracking_file is not None and self._pending_tracking_rows:
+            rows, self._pending_tracking_rows = self._pending_tracking_rows, []
+            with self._own_tracking_write():
+                csv.DictWriter(self._tracking_file, fieldnames=TRACKING_FIELDS, lineterminator='\n').writerows(rows)
+                self._tracking_file.flush()
+    
+    def _reopen_tracking_file(self):
+        """Point bulk_run()'s handle at the CSV again after it was replaced by an atomic rewrite"""
+        if self._tracking_file is not None:
+            self._tracking_file.close()
+            self._tracking_file = open(self.tracking_csv_path, 'a', newline='', encoding='utf-8')
+    
+    def _append_tracking_records(self, records: List[Dict]):
+        """Append tracking rows in one write and index them; older rows for the same club/type are dropped on compaction"""
+        rows = [{**record, **{field: format_cost(record[field]) for field in TRACKING_COST_FIELDS}} for record in records]
+        if self._tracking_file is not None:
+            self._pending_tracking_rows.extend(rows)
+            if len(self._pending_tracking_rows) >= TRACKING_FLUSH_EVERY:
+                self._flush_tracking_file()
+        else:
+            self._initialize_tracking_csv()
+            with self._own_tracking_write():
+                with open(self.tracking_csv_path, 'a', newline='', encoding='utf-8') as f:
+                    csv.DictWriter(f, fieldnames=TRACKING_FIELDS, lineterminator='\n').writerows(rows)
+        for record in records:
+            self._set_index_record((record['club_name'], record['email_type']), self._tracking_record(record))
+        
+        _tracking_csvs_to_compact.add(self.tracking_csv_path)
+        self._saves_since_compaction += len(records)
+        if self._saves_since_compaction >= TRACKING_COMPACT_EVERY and self._tracking_file is None:
+            self.compact_tracking_csv()
+    
+    def _update_tracking_record(self, club_name: str, email_type: str, **changes) -> bool:
+        """Append an updated copy of the latest row for a club/type on disk (False if there is none)"""
+        record = self._get_sent_index().get((club_name, email_type))
+        if record is None:
+            return False
+        self._append_tracking_records([{**record, **changes, 'club_name': club_name, 'email_type': email_type}])
+        return True
+    
+    def compact_tracking_csv(self) -> int:
+        """Drop superseded rows left by appended saves (atomic rewrite)"""
+        self._flush_tracking_file()
+        try:
+            with self._own_tracking_write():
+                dropped = _compact_tracking_file(self.tracking_csv_path)
+            self._saves_since_compaction = 0
+            if dropped:
+                print(f"🧹 Compacted email tracking: removed {dropped} superseded rows")
+            return dropped
+        except Exception as e:
+            print(f"⚠️ Error compacting email tracking: {e}")
+            return 0
+        finally:
+            self._reopen_tracking_file()
     
     def mark_email_as_sent(self, club_name: str, email_type: str = 'introduction'):
         """Mark an email as sent"""
         try:
-            tracking_df = pd.read_csv(self.tracking_csv_path)
-            mask = (tracking_df['club_name'] == club_name) & (tracking_df['email_type'] == email_type)
-            tracking_df.loc[mask, 'email_sent_date'] = datetime.now().isoformat()
-            tracking_df.to_csv(self.tracking_csv_path, index=False)
+            self._update_tracking_record(club_name, email_type, email_sent_date=datetime.now().isoformat())
             print(f"📤 {email_type.capitalize()} email marked as sent for {club_name}")
         except Exception as e:
             print(f"Error marking email as sent for {club_name}: {e}")
     
+    def get_email_statistics(self) -> Dict:
+        """Get statistics about generated emails and their costs (running totals; the file is re-read only if it changed)"""
+        self._get_sent_index()
+        totals = self._email_totals
+        return {
+            **totals,
+            'emails_by_type': dict(totals['emails_by_type']),
+            'total_content_cost': totals['total_content_cost'] / COST_SCALE,
+            'total_cost': totals['total_cost'] / COST_SCALE
+        }
+    
     def get_emails_by_type(self, email_type: str) -> List[Dict]:
-        """Get all emails of specific type"""
-        try:
-            tracking_df = pd.read_csv(self.tracking_csv_path)
-            type_emails = tracking_df[tracking_df['email_type'] == email_type]
-            return type_emails.to_dict('records')
-        except FileNotFoundError:
-            return []
+        """Get all emails of specific type (latest record per club, served from the in-memory index)"""
+        return [
+            {'club_name': club_name, 'email_type': record_type, **record}
+            for (club_name, record_type), record in self._get_sent_index().items() if record_type == email_type
+        ]
     
     def save_email_modification(self, club_name: str, modified_email: str, email_type: str = 'introduction') -> bool:
         """Save modified email content"""
         try:
-            tracking_df = pd.read_csv(self.tracking_csv_path)
-            mask = (tracking_df['club_name'] == club_name) & (tracking_df['email_type'] == email_type)
-            tracking_df.loc[mask, 'generated_email'] = modified_email
-            tracking_df.loc[mask, 'created_at'] = datetime.now().isoformat()
-            tracking_df.to_csv(self.tracking_csv_path, index=False)
+            self._update_tracking_record(club_name, email_type, generated_email=modified_email,
+                                         created_at=datetime.now().isoformat())
             return True
         except Exception as e:
             print(f"Error saving email modification: {e}")
             return False
     
     def delete_email_record(self, club_name: str, email_type: str = 'introduction') -> bool:
-        """Delete email record"""
+        """Delete email record (streams the CSV row by row into an atomic rewrite)"""
+        self._get_sent_index()
+        self._flush_tracking_file()
         try:
-            tracking_df = pd.read_csv(self.tracking_csv_path)
-            original_len = len(tracking_df)
-            tracking_df = tracking_df[
-                ~((tracking_df['club_name'] == club_name) & (tracking_df['email_type'] == email_type))
-            ]
-            tracking_df.to_csv(self.tracking_csv_path, index=False)
-            return len(tracking_df) < original_len
+            deleted = False
+            tmp_path = f"{self.tracking_csv_path}.tmp"
+            with self._own_tracking_write():
+                with open(self.tracking_csv_path, 'r', newline='', encoding='utf-8') as src, \
+                        open(tmp_path, 'w', newline='', encoding='utf-8') as dst:
+                    reader = csv.DictReader(src)
+                    writer = csv.DictWriter(dst, fieldnames=reader.fieldnames or TRACKING_FIELDS, lineterminator='\n')
+                    writer.writeheader()
+                    for row in reader:
+                        if row['club_name'] == club_name and row['email_type'] == email_type:
+                            deleted = True
+                        else:
+                            writer.writerow(row)
+                os.replace(tmp_path, self.tracking_csv_path)
+            self._set_index_record((club_name, email_type), None)
+            return deleted
         except Exception as e:
             print(f"Error deleting email record: {e}")
-            return False 
\ No newline at end of file
+            return False
+        finally:
+            self._reopen_tracking_file() 
\ No newline at end of file
@@ -1,11 +1,19 @@
-import pandas as pd
 import os
+import csv
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import time
-from brevo_email_service import BrevoEmailService
+from brevo_email_service import BrevoEmailService, get_connected_brevo_service
 from club_status_manager import ClubStatusManager, ResponseStatus
 
+RESPONSE_FIELDS = (
+    'response_id', 'club_name', 'contact_name', 'contact_email',
+    'email_type', 'response_type', 'response_content', 'response_date',
+    'detection_method', 'processed', 'created_at'
+)
+
+
 class ResponseManager:
     """
     Manages email responses detection and storage.
@@ -13,18 +21,17 @@ class ResponseManager:
     """
     
     def __init__(self):
-        self.brevo_service = None
+        self._brevo_service: Optional[BrevoEmailService] = None  # connected on first use, not on every instantiation
         self.status_manager = ClubStatusManager()
         self.responses_csv_path = 'data/email_responses.csv'
+        self.processed_ids_path = 'data/processed_responses.txt'  # one response_id per line, append-only
+        
+        # In-memory copy of the responses CSV, re-read only when the file changes
+        self._rows: Optional[List[Dict]] = None
+        self._responses_mtime = None
+        self._response_keys = set()  # (club_name, email_type, contact_email) of saved responses
+        self._contact_names: Optional[Dict[Tuple[str, str], str]] = None  # (Club, Email) -> Name, loaded on first use
         
-        # Initialize Brevo service if available
-        try:
-            self.brevo_service = BrevoEmailService()
-            test_result = self.brevo_service.test_connection()
-            self.brevo_available = test_result['success']
-        except:
-            self.brevo_available = False
-            
         self._initialize_responses_csv()
     
     def _initialize_responses_csv(self):
@@ -32,12 +39,51 @@ class ResponseManager:
         os.makedirs('data', exist_ok=True)
         
         if not os.path.exists(self.responses_csv_path):
-            responses_df = pd.DataFrame(columns=[
-                'response_id', 'club_name', 'contact_name', 'contact_email', 
-                'email_type', 'response_type', 'response_content', 'response_date',
-                'detection_method', 'processed', 'created_at'
-            ])
-            responses_df.to_csv(self.responses_csv_path, index=False)
+            with open(self.responses_csv_path, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f, lineterminator='\n').writerow(RESPONSE_FIELDS)
+    
+    @property
+    def brevo_service(self) -> Optional[BrevoEmailService]:
+        """Shared Brevo service, connected (and tested) on first use; None while Brevo is unreachable"""
+        if self._brevo_service is None:
+            self._brevo_service = get_connected_brevo_service()
+        return self._brevo_service
+    
+    @property
+    def brevo_available(self) -> bool:
+        """True if the Brevo API passed its connection test"""
+        return self.brevo_service is not None
+    
+    def _files_mtime(self) -> Tuple[Optional[float], Optional[float]]:
+        """Modification times of the responses CSV and the processed-ids file (None if missing)"""
+        mtimes = []
+        for path in (self.responses_csv_path, self.processed_ids_path):
+            try:
+                mtimes.append(os.stat(path).st_mtime)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+    
+    def _get_rows(self) -> List[Dict]:
+        """Saved responses as row dicts (cached; re-read when another process changes either file)"""
+        responses_mtime = self._files_mtime()
+        if self._rows is None or responses_mtime[0] is None or responses_mtime != self._responses_mtime:
+            with open(self.responses_csv_path, newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+            processed_ids = set()
+            if responses_mtime[1] is not None:
+                with open(self.processed_ids_path, encoding='utf-8') as f:
+                    processed_ids = set(f.read().splitlines())
+            for row in rows:
+                row['processed'] = row['processed'] == 'True' or row['response_id'] in processed_ids
+            self._rows = rows
+            self._responses_mtime = responses_mtime
+            self._response_keys = {(row['club_name'], row['email_type'], row['contact_email']) for row in rows}
+        return self._rows
+    
+    def _file_written(self):
+        """Adopt our own write as the cached copy, so it isn't re-read"""
+        self._responses_mtime = self._files_mtime()
     
     def check_for_new_responses(self) -> List[Dict]:
         """Check for new responses from multiple sources"""
@@ -48,78 +94,96 @@ class ResponseManager:
             brevo_responses = self.brevo_service.check_for_new_responses()
             new_responses.extend(brevo_responses)
         
-        # 2. Save detected responses
-        for response in new_responses:
-            self.save_response(
-                club_name=response['club_name'],
-                contact_email=response['contact_email'],
-                email_type=response['email_type'],
-                response_content=response['response_content'],
-                response_type='positive_response',  # Default assumption
-                detection_method='brevo_api'
-            )
+        # 2. Save detected responses in one append
+        try:
+            self._get_rows()
+            new_rows = []
+            batch_keys = set()
+            for response in new_responses:
+                response_key = (response['club_name'], response['email_type'], response['contact_email'])
+                if response_key in self._response_keys or response_key in batch_keys:
+                    continue
+                batch_keys.add(response_key)
+                new_rows.append(self._build_response_row(
+                    club_name=response['club_name'],
+                    contact_email=response['contact_email'],
+                    email_type=response['email_type'],
+                    response_content=response['response_content'],
+                    response_type='positive_response',  # Default assumption
+                    detection_method='brevo_api'
+                ))
+            
+            if new_rows:
+                self._append_rows(new_rows)
+                for row in new_rows:
+                    self._record_saved_response(row)
+                print(f"✅ Saved {len(new_rows)} new responses")
+                
+        except Exception as e:
+            print(f"Error saving responses: {e}")
         
         return new_responses
     
+    def _build_response_row(self, club_name: str, contact_email: str, email_type: str,
+                            response_content: str, response_type: str, detection_method: str) -> Dict:
+        """A new, unprocessed response row"""
+        now_iso = datetime.now().isoformat()
+        return {
+            'response_id': f"{club_name}_{email_type}_{int(time.time())}",
+            'club_name': club_name,
+            'contact_name': self._get_contact_name(club_name, contact_email),
+            'contact_email': contact_email,
+            'email_type': email_type,
+            'response_type': response_type,
+            'response_content': response_content,
+            'response_date': now_iso,
+            'detection_method': detection_method,
+            'processed': False,
+            'created_at': now_iso
+        }
+    
+    def _append_rows(self, new_rows: List[Dict]):
+        """Append rows to the CSV and the cached copy; the file is never re-read or rewritten here"""
+        rows = self._get_rows()
+        with open(self.responses_csv_path, 'a', newline='', encoding='utf-8', buffering=1 << 16) as f:
+            csv.DictWriter(f, fieldnames=RESPONSE_FIELDS, lineterminator='\n').writerows(new_rows)
+        rows.extend(new_rows)
+        self._file_written()
+        self._response_keys.update((row['club_name'], row['email_type'], row['contact_email']) for row in new_rows)
+    
+    def _record_saved_response(self, row: Dict):
+        """Update the club status and the Brevo conversation for a saved response"""
+        self.status_manager.record_response(
+            club_name=row['club_name'],
+            email_type=row['email_type'],
+            response_type=row['response_type'],
+            notes=f"Response: {row['response_content'][:100]}..."
+        )
+        
+        # Save to Brevo conversation if available
+        if self.brevo_available:
+            self.brevo_service.add_reply(
+                club_name=row['club_name'],
+                contact_email=row['contact_email'],
+                subject=f"Re: {row['email_type'].title()} Email",
+                content=row['response_content']
+            )
+    
     def save_response(self, club_name: str, contact_email: str, email_type: str, 
                      response_content: str, response_type: str = 'positive_response',
                      detection_method: str = 'manual') -> bool:
         """Save a response permanently"""
         try:
-            # Generate response ID
-            response_id = f"{club_name}_{email_type}_{int(time.time())}"
-            
-            # Get contact name from contacts data
-            contact_name = self._get_contact_name(club_name, contact_email)
-            
-            # Load existing responses
-            responses_df = pd.read_csv(self.responses_csv_path)
-            
             # Check if this response already exists
-            existing = responses_df[
-                (responses_df['club_name'] == club_name) & 
-                (responses_df['email_type'] == email_type) &
-                (responses_df['contact_email'] == contact_email)
-            ]
-            
-            if not existing.empty:
+            self._get_rows()
+            if (club_name, email_type, contact_email) in self._response_keys:
                 print(f"Response already exists for {club_name} - {email_type}")
                 return False
             
-            # Add new response
-            new_response = pd.DataFrame([{
-                'response_id': response_id,
-                'club_name': club_name,
-                'contact_name': contact_name,
-                'contact_email': contact_email,
-                'email_type': email_type,
-                'response_type': response_type,
-                'response_content': response_content,
-                'response_date': datetime.now().isoformat(),
-                'detection_method': detection_method,
-                'processed': False,
-                'created_at': datetime.now().isoformat()
-            }])
-            
-            responses_df = pd.concat([responses_df, new_response], ignore_index=True)
-            responses_df.to_csv(self.responses_csv_path, index=False)
-            
-            # Update status manager
-            self.status_manager.record_response(
-                club_name=club_name,
-                email_type=email_type,
-                response_type=response_type,
-                notes=f"Response: {response_content[:100]}..."
-            )
-            
-            # Save to Brevo conversation if available
-            if self.brevo_available:
-                self.brevo_service.add_reply(
-                    club_name=club_name,
-                    contact_email=contact_email,
-                    subject=f"Re: {email_type.title()} Email",
-                    content=response_content
-                )
+            new_response = self._build_response_row(club_name, contact_email, email_type,
+                                                    response_content, response_type, detection_method)
+            self._append_rows([new_response])
+            self._record_saved_response(new_response)
             
             print(f"✅ Response saved for {club_name} - {email_type}")
             return True
@@ -128,28 +192,32 @@ class ResponseManager:
             print(f"Error saving response: {e}")
             return False
     
+    def _load_contact_names(self) -> Dict[Tuple[str, str], str]:
+        """Read the contacts CSV once into {(Club, Email): Name}, keeping the first row per pair"""
+        possible_paths = [
+            "test_results_20250701_092437.csv",
+            "../test_results_20250701_092437.csv", 
+            os.path.join(os.path.dirname(__file__), "..", "test_results_20250701_092437.csv"),
+        ]
+        
+        for path in possible_paths:
+            if os.path.exists(path):
+                contact_names = {}
+                with open(path, newline='', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        club, email = row.get('Club'), row.get('Email')
+                        if club and email:  # missing values never match a lookup
+                            contact_names.setdefault((club, email), row.get('Name') or 'Unknown')
+                return contact_names
+        
+        return {}
+    
     def _get_contact_name(self, club_name: str, contact_email: str) -> str:
         """Get contact name from contacts CSV"""
         try:
-            # Try to load contacts data
-            possible_paths = [
-                "test_results_20250701_092437.csv",
-                "../test_results_20250701_092437.csv", 
-                os.path.join(os.path.dirname(__file__), "..", "test_results_20250701_092437.csv"),
-            ]
-            
-            for path in possible_paths:
-                if os.path.exists(path):
-                    contacts_df = pd.read_csv(path, encoding='utf-8', on_bad_lines='skip')
-                    contact = contacts_df[
-                        (contacts_df['Club'] == club_name) & 
-                        (contacts_df['Email'] == contact_email)
-                    ]
-                    if not contact.empty:
-                        return contact.iloc[0].get('Name', 'Unknown')
-                    break
-            
-            return 'Unknown'
+            if self._contact_names is None:
+                self._contact_names = self._load_contact_names()
+            return self._contact_names.get((club_name, contact_email), 'Unknown')
             
         except Exception as e:
             return 'Unknown'
@@ -157,12 +225,12 @@ class ResponseManager:
     def get_all_responses(self, club_name: str = None) -> List[Dict]:
         """Get all saved responses"""
         try:
-            responses_df = pd.read_csv(self.responses_csv_path)
+            rows = self._get_rows()
             
             if club_name:
-                responses_df = responses_df[responses_df['club_name'] == club_name]
+                rows = [row for row in rows if row['club_name'] == club_name]
             
-            return responses_df.to_dict('records')
+            return [dict(row) for row in rows]
             
         except Exception as e:
             print(f"Error getting responses: {e}")
@@ -171,9 +239,7 @@ class ResponseManager:
     def get_unprocessed_responses(self) -> List[Dict]:
         """Get responses that haven't been processed yet"""
         try:
-            responses_df = pd.read_csv(self.responses_csv_path)
-            unprocessed = responses_df[responses_df['processed'] == False]
-            return unprocessed.to_dict('records')
+            return [dict(row) for row in self._get_rows() if not row['processed']]
             
         except Exception as e:
             print(f"Error getting unprocessed responses: {e}")
@@ -182,12 +248,16 @@ class ResponseManager:
     def mark_response_processed(self, response_id: str) -> bool:
         """Mark a response as processed"""
         try:
-            responses_df = pd.read_csv(self.responses_csv_path)
-            mask = responses_df['response_id'] == response_id
+            matched = [row for row in self._get_rows() if row['response_id'] == response_id]
             
-            if mask.any():
-                responses_df.loc[mask, 'processed'] = True
-                responses_df.to_csv(self.responses_csv_path, index=False)
+            if matched:
+                # Append the id instead of rewriting the whole CSV for one flag
+                if not all(row['processed'] for row in matched):
+                    with open(self.processed_ids_path, 'a', encoding='utf-8') as f:
+                        f.write(f"{response_id}\n")
+                    for row in matched:
+                        row['processed'] = True
+                    self._file_written()
                 return True
             
             return False
@@ -199,18 +269,18 @@ class ResponseManager:
     def get_response_stats(self) -> Dict:
         """Get response statistics"""
         try:
-            responses_df = pd.read_csv(self.responses_csv_path)
+            rows = self._get_rows()
             
-            if responses_df.empty:
+            if not rows:
                 return {'total_responses': 0}
             
             stats = {
-                'total_responses': len(responses_df),
-                'by_email_type': responses_df['email_type'].value_counts().to_dict(),
-                'by_response_type': responses_df['response_type'].value_counts().to_dict(),
-                'by_club': responses_df['club_name'].value_counts().to_dict(),
-                'recent_responses': responses_df.tail(5).to_dict('records'),
-                'unprocessed_count': len(responses_df[responses_df['processed'] == False])
+                'total_responses': len(rows),
+                'by_email_type': dict(Counter(row['email_type'] for row in rows).most_common()),
+                'by_response_type': dict(Counter(row['response_type'] for row in rows).most_common()),
+                'by_club': dict(Counter(row['club_name'] for row in rows).most_common()),
+                'recent_responses': [dict(row) for row in rows[-5:]],
+                'unprocessed_count': sum(1 for row in rows if not row['processed'])
             }
             
             return stats
@@ -0,0 +1,104 @@
+import sqlite3
+import json
+import threading
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional: faster payload (de)serialization when installed
+    orjson = None
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache stored in SQLite.
+
+    Entries are (normalized float32 embedding, JSON payload) pairs grouped by namespace.
+    A lookup returns the payload of the most similar entry when its cosine similarity
+    reaches the threshold, so near-duplicate prompts can reuse an earlier result.
+    
+    Each instance keeps one SQLite connection (WAL journal) open for its lifetime.
+    """
+
+    def __init__(self, db_path: str, namespace: str, threshold: float = 0.92):
+        self.db_path = db_path
+        self.namespace = namespace
+        self.threshold = threshold
+        self._matrix = None
+        self._payloads: List[Dict] = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")  # readers don't block the writer
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # safe with WAL, one fsync per checkpoint
+        self._initialize_database()
+
+    def _initialize_database(self):
+        """Create the cache table if needed"""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS semantic_cache (
+                    namespace TEXT NOT NULL,
+                    cache_key TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (namespace, cache_key)
+                )
+            """)
+
+    def _load(self):
+        """Load this namespace's embeddings into one matrix (once per instance)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT embedding, payload FROM semantic_cache WHERE namespace = ?", (self.namespace,)
+            ).fetchall()
+
+        if rows:
+            self._matrix = np.vstack([np.frombuffer(embedding, dtype=np.float32) for embedding, _ in rows])
+        else:
+            self._matrix = np.empty((0, 0), dtype=np.float32)
+        loads = orjson.loads if orjson is not None else json.loads
+        self._payloads = [loads(payload) for _, payload in rows]
+
+    @staticmethod
+    def normalize(embedding) -> np.ndarray:
+        """Return the embedding as a unit-length float32 vector"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, embedding) -> Optional[Tuple[Dict, float]]:
+        """Return (payload, similarity) for the closest entry above the threshold, else None"""
+        if self._matrix is None:
+            self._load()
+
+        query = self.normalize(embedding)
+        if not len(self._payloads) or self._matrix.shape[1] != query.shape[0]:
+            return None
+
+        similarities = self._matrix @ query
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.threshold:
+            return self._payloads[best], float(similarities[best])
+        return None
+
+    def store(self, cache_key: str, embedding, payload: Dict):
+        """Store (or replace) the entry for cache_key"""
+        vector = self.normalize(embedding)
+        payload_json = orjson.dumps(payload).decode('utf-8') if orjson is not None else json.dumps(payload)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO semantic_cache (namespace, cache_key, embedding, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, cache_key, vector.tobytes(), payload_json, datetime.now().isoformat())
+            )
+
+        # Reload on the next lookup so replaced keys don't linger in memory
+        self._matrix = None
+
+    def close(self):
+        """Close the SQLite connection"""
+        with self._lock:
+            self._conn.close()
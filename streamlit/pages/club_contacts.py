@@ -192,6 +192,7 @@ def get_filtered_clubs(status_manager, filters):
     try:
         # Read the status tracking data
         import pandas as pd
+        status_manager.flush()
         df = pd.read_csv(status_manager.status_csv_path)
         
         if df.empty:
@@ -258,10 +259,11 @@ def show_club_selector(contacts_df, status_manager, filtered_clubs):
     options = ["Select a club..."]
     values = [""]
     
+    # One status read for all badges instead of one per club
+    club_stages = status_manager.get_club_stages()
     for club in available_clubs:
-        club_status = status_manager.get_club_status(club)
-        if club_status:
-            stage = club_status.get('current_stage', 'new')
+        stage = club_stages.get(club)
+        if stage is not None:
             badge = stage.upper()[:4]
             options.append(f"{club} [{badge}]")
         else:
@@ -19,6 +19,12 @@ except ImportError as e:
     st.error("Please make sure all dependencies are installed and files are in the correct location.")
     st.stop()
 
+# Cache the personalizer across reruns so its clubs, template and tracking caches persist
+@st.cache_resource
+def get_email_personalizer():
+    """Shared EmailPersonalizer for this app process"""
+    return EmailPersonalizer()
+
 def email_generator_page():
     """Clean, full-width email generator interface"""
     
@@ -83,7 +89,7 @@ def email_generator_page():
     
     try:
         # Initialize managers
-        email_personalizer = EmailPersonalizer()
+        email_personalizer = get_email_personalizer()
         status_manager = ClubStatusManager()
         
         # Initialize Brevo service (optional)
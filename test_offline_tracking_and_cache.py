@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Offline tests for email tracking and the completion cache.
+
+No API key or network access is needed; everything runs in a temporary directory:
+1. Tracking round-trip - save, mark sent, modify, delete, compact, reload
+2. Quoted and multi-line fields surviving appends and compaction
+3. bulk_run() buffering rows and flushing them to disk
+4. Completion cache replaying its JSONL file and recovering from a torn last line
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+# The clients are never used, but the constructors insist on a key
+os.environ.setdefault('OPENAI_API_KEY', 'sk-offline-test')
+
+import email_personalizer
+from email_personalizer import EmailPersonalizer
+from completion_cache import CompletionCache
+
+COSTS = {'content_cost': 0.0012, 'total_cost': 0.0034}
+
+
+@contextmanager
+def temporary_workdir():
+    """Run in an empty directory, so the tracking CSV starts fresh and the real one is untouched"""
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        try:
+            yield work_dir
+        finally:
+            # Nothing left for the exit-time compaction once the directory is gone
+            email_personalizer._tracking_csvs_to_compact.discard('sent_emails_tracking.csv')
+            os.chdir(previous_dir)
+
+
+def count_tracking_rows(tracking_csv_path: str) -> int:
+    """Data rows in the tracking CSV as written on disk"""
+    return len(email_personalizer.read_tracking_csv(tracking_csv_path))
+
+
+def test_tracking_round_trip():
+    """Save, mark sent, modify, delete and compact, then check a fresh instance reads the same state"""
+    print("🧪 Testing tracking round-trip...")
+
+    with temporary_workdir():
+        personalizer = EmailPersonalizer()
+        personalizer.save_generated_email('Alpha Club', 'Alpha content', 'Alpha email', COSTS, 'introduction')
+        personalizer.save_generated_email('Beta Club', 'Beta content', 'Beta email', COSTS, 'introduction')
+        personalizer.save_generated_email('Alpha Club', 'Alpha checkup', 'Alpha checkup email', COSTS, 'checkup')
+
+        found, record = personalizer.check_email_sent('Alpha Club', 'introduction')
+        assert found and record['generated_email'] == 'Alpha email' and record['email_sent_date'] is None
+
+        personalizer.mark_email_as_sent('Alpha Club', 'introduction')
+        assert personalizer.check_email_sent('Alpha Club', 'introduction')[1]['email_sent_date']
+
+        assert personalizer.save_email_modification('Alpha Club', 'Alpha email, edited', 'introduction')
+        assert personalizer.check_email_sent('Alpha Club', 'introduction')[1]['generated_email'] == 'Alpha email, edited'
+
+        assert personalizer.delete_email_record('Beta Club', 'introduction')
+        assert personalizer.check_email_sent('Beta Club', 'introduction') == (False, None)
+
+        # Two appended updates for Alpha's introduction are superseded
+        assert personalizer.compact_tracking_csv() == 2
+        assert count_tracking_rows(personalizer.tracking_csv_path) == 2
+
+        reloaded = EmailPersonalizer()
+        found, record = reloaded.check_email_sent('Alpha Club', 'introduction')
+        assert found and record['generated_email'] == 'Alpha email, edited' and record['email_sent_date']
+        assert record['total_cost'] == COSTS['total_cost']
+        assert reloaded.check_email_sent('Alpha Club', 'checkup')[1]['generated_email'] == 'Alpha checkup email'
+        assert reloaded.check_email_sent('Beta Club', 'introduction') == (False, None)
+
+        stats = reloaded.get_email_statistics()
+        assert stats['total_emails'] == 2 and stats['sent_emails'] == 1
+        assert stats['emails_by_type'] == {'introduction': 1, 'checkup': 1}
+        assert abs(stats['total_cost'] - 2 * COSTS['total_cost']) < 1e-9
+
+    print("✅ Tracking round-trip: SUCCESS")
+
+
+def test_quoted_multiline_fields():
+    """Commas, quotes and line breaks must come back unchanged after appends and compaction"""
+    print("🧪 Testing quoted and multi-line fields...")
+
+    tricky_content = 'They said "sharp, vivid colours",\nthen: "thanks!"'
+    tricky_email = 'Hello "Gamma", friends\n\nLine two, with a comma\r\nand a "quote"'
+
+    with temporary_workdir():
+        personalizer = EmailPersonalizer()
+        personalizer.save_generated_email('Gamma, "The" Club', tricky_content, tricky_email, COSTS, 'introduction')
+        personalizer.save_generated_email('Gamma, "The" Club', tricky_content, tricky_email + '!', COSTS, 'introduction')
+
+        record = EmailPersonalizer().check_email_sent('Gamma, "The" Club', 'introduction')[1]
+        assert record['personalized_content'] == tricky_content
+        assert record['generated_email'] == tricky_email + '!'
+
+        assert personalizer.compact_tracking_csv() == 1
+        record = EmailPersonalizer().check_email_sent('Gamma, "The" Club', 'introduction')[1]
+        assert record['personalized_content'] == tricky_content
+        assert record['generated_email'] == tricky_email + '!'
+
+    print("✅ Quoted and multi-line fields: SUCCESS")
+
+
+def test_bulk_run_flushing():
+    """Rows saved in bulk_run() are indexed at once, written every TRACKING_FLUSH_EVERY rows and on exit"""
+    print("🧪 Testing bulk_run flushing...")
+
+    flush_every = email_personalizer.TRACKING_FLUSH_EVERY
+    email_personalizer.TRACKING_FLUSH_EVERY = 3
+    try:
+        with temporary_workdir():
+            personalizer = EmailPersonalizer()
+            with personalizer.bulk_run():
+                personalizer.save_generated_email('Club 1', 'content 1', 'email 1', COSTS, 'introduction')
+                personalizer.save_generated_email('Club 2', 'content 2', 'email 2', COSTS, 'introduction')
+                # Buffered: visible to this instance, not yet on disk
+                assert count_tracking_rows(personalizer.tracking_csv_path) == 0
+                assert personalizer.check_email_sent('Club 2', 'introduction')[1]['generated_email'] == 'email 2'
+
+                personalizer.save_generated_email('Club 3', 'content 3', 'email 3', COSTS, 'introduction')
+                assert count_tracking_rows(personalizer.tracking_csv_path) == 3
+
+                personalizer.save_generated_email('Club 4', 'content 4', 'email 4', COSTS, 'introduction')
+                assert count_tracking_rows(personalizer.tracking_csv_path) == 3
+
+                # Another instance sees the buffered row only once it is flushed
+                assert EmailPersonalizer().check_email_sent('Club 4', 'introduction') == (False, None)
+
+            assert count_tracking_rows(personalizer.tracking_csv_path) == 4
+            assert EmailPersonalizer().check_email_sent('Club 4', 'introduction')[1]['generated_email'] == 'email 4'
+            assert personalizer.get_email_statistics()['total_emails'] == 4
+    finally:
+        email_personalizer.TRACKING_FLUSH_EVERY = flush_every
+
+    print("✅ bulk_run flushing: SUCCESS")
+
+
+def make_completion(content: str, finish_reason: str = 'stop') -> SimpleNamespace:
+    """Just the parts of a ChatCompletion that CompletionCache.put reads"""
+    return SimpleNamespace(
+        model='gpt-test',
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason=finish_reason)]
+    )
+
+
+def make_request(prompt: str) -> dict:
+    return {'model': 'gpt-test', 'messages': [{'role': 'user', 'content': prompt}], 'temperature': 0}
+
+
+def test_completion_cache_replay():
+    """Entries are replayed from the JSONL file, discards stick, and a torn last line is dropped"""
+    print("🧪 Testing completion cache replay...")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_path = os.path.join(cache_dir, 'completions.jsonl')
+
+        cache = CompletionCache(cache_path)
+        cache.put(make_request('first'), make_completion('first reply'))
+        cache.put(make_request('second'), make_completion('second reply'))
+        cache.put(make_request('third'), make_completion('third reply'))
+        cache.put(make_request('cut off'), make_completion('partial', finish_reason='length'))
+        cache.discard(make_request('third'))
+
+        replayed = CompletionCache(cache_path)
+        assert replayed.get(make_request('first')).choices[0].message.content == 'first reply'
+        assert replayed.get(make_request('second')).choices[0].message.content == 'second reply'
+        assert replayed.get(make_request('third')) is None
+        assert replayed.get(make_request('cut off')) is None
+
+        # A crash mid-append leaves half a line without a newline
+        with open(cache_path, 'ab') as f:
+            f.write(b'["0123abcd", {"model": "gpt-test", "cont')
+
+        recovered = CompletionCache(cache_path)
+        assert recovered.get(make_request('first')).choices[0].message.content == 'first reply'
+        assert recovered.get_stats()['entries'] == 2
+
+        # The torn line is gone, so the next append starts on a line of its own
+        recovered.put(make_request('fourth'), make_completion('fourth reply'))
+        reloaded = CompletionCache(cache_path)
+        assert reloaded.get(make_request('fourth')).choices[0].message.content == 'fourth reply'
+        assert reloaded.get_stats()['entries'] == 3
+
+    print("✅ Completion cache replay: SUCCESS")
+
+
+if __name__ == "__main__":
+    test_tracking_round_trip()
+    test_quoted_multiline_fields()
+    test_bulk_run_flushing()
+    test_completion_cache_replay()
+    print("\n🎯 All offline tests passed")